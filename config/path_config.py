@@ -9,6 +9,25 @@ DATA = "data"
 AUTH = "config/auth"
 
 AUTH_TWITTER = BASE_DIR / "config" / "auth" / "twitter_auth.json"
+# Extra storage_state files, one per X account, for the multi-session pool
+AUTH_SESSIONS_DIR = BASE_DIR / "config" / "auth" / "sessions"
+
+# Scraper state lives next to the worker's mounted data so it survives container restarts
+STATE_DIR = BASE_DIR / "data" / "from_prefect" / "state"
+WATERMARK_PATH = STATE_DIR / "tag_watermarks.json"
+SPOOL_DIR = STATE_DIR / "spool"
+REPLAY_DIR = STATE_DIR / "replay"
+TAG_STATS_PATH = STATE_DIR / "tag_stats.json"
+LEASE_DB_PATH = STATE_DIR / "tag_leases.sqlite"
+# Warm browser service: endpoints written by the service, one profile per account
+BROWSER_SERVICE_PATH = STATE_DIR / "browser_service.json"
+BROWSER_PROFILE_DIR = STATE_DIR / "browser_profiles"
+BROWSER_SERVICE_PORT = 9222
+# Raw timeline JSON and article HTML kept for re-parsing without re-scraping
+RAW_ARCHIVE_DIR = BASE_DIR / "data" / "from_prefect" / "raw"
+QUARANTINE_DIR = STATE_DIR / "quarantine"
+# Session validation markers, kept out of the sessions directory so they are not read as accounts
+SESSION_CHECK_DIR = STATE_DIR / "session_checks"
 
 repo_name = "tweets-repo"
 repo_name_ml = "tweets-repo-wordcloud"
@@ -24,6 +43,16 @@ lakefs_s3_path = f"s3://{repo_name}/{branch_name}/{path}"
 lakefs_s3_path_ml = f"s3://{repo_name_ml}/{branch_name}/{path_ml}"
 lakefs_s3_path_hash = f"s3://{repo_name_hash}/{branch_name}/{path_hash}"
 
+# Scrape-time prefilter overrides per tag. Keys: scripts (thai / latin / other / none),
+# min_post_time (ISO date) and require_tag (hashtag must appear in the text).
+# The script is read from the text outside hashtags, links and mentions, or from the
+# hashtags when nothing else is left. Other Latin-script languages pass a "latin"
+# rule: a Spanish #CISTU tweet is only rejected by the min_post_time floor.
+tag_filter_rules = {
+    # Also used by the Tulsa and Tulane law schools, which post in English
+    "#TUlaw": {"scripts": ["thai"]},
+}
+
 tags = {
     "ธรรมศาสตร์": [
         "#ธรรมศาสตร์ช้างเผือก",
@@ -0,0 +1,60 @@
+import json
+import os
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+PARTIAL = "partial"
+DONE = "done"
+
+
+# Per-tag progress kept next to the spooled Parquet parts. A restarted run skips
+# tags marked done and resumes partial ones below the oldest status ID collected.
+class ScrapeCheckpoint:
+    def __init__(self, root: str | Path):
+        self.path = Path(root) / "manifest.json"
+        self.tags: dict[str, dict] = self._read()
+
+    def is_done(self, tag: str) -> bool:
+        return self.tags.get(tag, {}).get("status") == DONE
+
+    def resume_point(self, tag: str) -> tuple[int | None, int]:
+        entry = self.tags.get(tag, {})
+        return entry.get("oldest_id"), entry.get("scrolls", 0)
+
+    def update(self, tag: str, oldest_id: int | None, tweets: int, scrolls: int) -> None:
+        entry = self.tags.setdefault(tag, {"status": PARTIAL, "scrolls": 0, "tweets": 0, "oldest_id": None})
+        # Total scrolls so far, including ones whose tweets were all deduped or filtered
+        entry["scrolls"] = scrolls
+        entry["tweets"] += tweets
+        if oldest_id is not None and (entry["oldest_id"] is None or oldest_id < entry["oldest_id"]):
+            entry["oldest_id"] = oldest_id
+        self.save()
+
+    def mark_done(self, tag: str) -> None:
+        self.tags.setdefault(tag, {"scrolls": 0, "tweets": 0, "oldest_id": None})["status"] = DONE
+        self.save()
+        logger.debug(f"Checkpointed tag {tag} as done")
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.tags, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                tags = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+        done = sum(entry.get("status") == DONE for entry in tags.values())
+        logger.info(f"Resuming from checkpoint: {done} tags done, {len(tags) - done} partial")
+        return tags
@@ -32,9 +32,7 @@ class LakeFSLoader:
         logger.debug(f"Connected to lakeFS version: {self.client.version}")
 
     def load_hash(self, df: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name_hash):
-        logger.info(f"Creating or replacing repository hash: {repo_name}")
-        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}")
-        logger.info(f"Repository {repo_name} hash created or already exists.")
+        self.create_repository(repo_name)
 
         storage_options = {
             "key": os.getenv("ACCESS_KEY"),
@@ -111,13 +109,12 @@ class LakeFSLoader:
         except Exception as e:
             logger.error("Error connecting to lakeFS", exc_info=True)
 
-    def load(self, data: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name, lakefs_s3_path: str = lakefs_s3_path) -> None:
-        logger.info(f"Creating or replacing repository: {repo_name}")
-        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}")
+    def create_repository(self, repo_name: str = repo_name) -> None:
+        # exist_ok, so reruns and repeated loads reuse the repository instead of failing
+        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}", exist_ok=True)
         logger.info(f"Repository {repo_name} created or already exists.")
 
-        logger.debug(f"Uploading data to lakeFS repository: {repo_name} on branch: {branch_name}")
-
+    def append(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path) -> None:
         storage_options = {
             "key": os.getenv("ACCESS_KEY"),
             "secret": os.getenv("SECRET_KEY"),
@@ -125,13 +122,28 @@ class LakeFSLoader:
                 "endpoint_url": lakefs_endpoint
             }
         }
-        
+        # Partitioned writes add new files, so existing data is left in place
         data.to_parquet(
             lakefs_s3_path,
             storage_options=storage_options,
             partition_cols=['year', 'month', 'day'],
             engine='pyarrow',
         )
+        logger.info(f"Appended {len(data)} records to {lakefs_s3_path}")
+
+    def load(self, data: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name, lakefs_s3_path: str = lakefs_s3_path) -> None:
+        self.create_repository(repo_name)
+
+        logger.debug(f"Uploading data to lakeFS repository: {repo_name} on branch: {branch_name}")
+
+        storage_options = {
+            "key": os.getenv("ACCESS_KEY"),
+            "secret": os.getenv("SECRET_KEY"),
+            "client_kwargs": {
+                "endpoint_url": lakefs_endpoint
+            }
+        }
+        self.append(data, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path)
 
         valid_data = pd.read_parquet(
             lakefs_s3_path,
@@ -0,0 +1,43 @@
+import shutil
+import uuid
+from pathlib import Path
+import pandas as pd
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Local Parquet spool for scraped batches, so a run only holds one batch per tag in
+# memory while scraping and reads everything back once for the load step.
+class ParquetSpool:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def write(self, df: pd.DataFrame) -> Path | None:
+        if df.empty:
+            return None
+        part_path = self.root / f"part-{uuid.uuid4().hex}.parquet"
+        df.to_parquet(part_path, engine="pyarrow", index=False)
+        logger.debug(f"Spooled {len(df)} records to {part_path}")
+        return part_path
+
+    def parts(self) -> list[Path]:
+        return sorted(self.root.glob("part-*.parquet"), key=lambda path: path.stat().st_mtime)
+
+    def read(self) -> pd.DataFrame:
+        parts = self.parts()
+        if not parts:
+            return pd.DataFrame()
+        data = pd.concat(
+            [pd.read_parquet(part, engine="pyarrow") for part in parts],
+            ignore_index=True,
+        )
+        logger.info(f"Read {len(data)} spooled records from {len(parts)} parts in {self.root}")
+        return data
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        logger.debug(f"Cleared spool {self.root}")
@@ -1,19 +1,46 @@
 from prefect import flow, task
+from prefect.cache_policies import NO_CACHE
 from prefect.schedules import Interval
 from pathlib import Path
+from contextlib import nullcontext
 import pandas as pd
-from datetime import timedelta
+from datetime import datetime, timedelta
 import asyncio
+import time
 # Import XScraping for scraping
-from src.backend.scraping.x_scraping import XScraping
+from src.backend.scraping.x_scraping import XScraping, COMPLETE_STOPS
+# Import multi-account session pool
+from src.backend.scraping.session_pool import SessionPool, discover_storage_states
+# Import per-tag yield stats and deadline-aware scroll budgets
+from src.backend.scraping.tag_stats import TagStatsStore
+from src.backend.scraping.scroll_scheduler import ScrollBudgetScheduler
+from src.backend.scraping.tag_activity import TagActivityPolicy
+# Import cached session validation
+from src.backend.scraping.x_login import check_session
+# Import per-tag watermarks
+from src.backend.scraping.watermark import TagWatermarkStore
+# Import raw capture archive
+from src.backend.scraping.raw_archive import RawArchive
+# Import scrape-time relevance filter
+from src.backend.scraping.tweet_filter import TweetFilter
+# Import sliding-window tag scheduler
+from src.backend.scraping.tag_scheduler import SlidingWindowScheduler
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query, with_max_id
+# Import pipelined validate, classify and load stages
+from src.backend.pipeline.staged_load import StagedLoadPipeline
 # Import LakeFS loader
 from src.backend.load.lakefs_loader import LakeFSLoader
+# Import local batch spool
+from src.backend.load.spool import ParquetSpool
 # Import validation configuration
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import modern logging configuration
 from config.logging.modern_log import LoggingConfig
 # Import path configuration
-from config.path_config import tags, lakefs_s3_path_ml
+from config.path_config import tags, lakefs_s3_path_ml, SPOOL_DIR
 # Import wordcloud 
 from src.backend.ml.wordcloud import WordCloud
 
@@ -29,83 +56,161 @@ def load_wordcloud_to_lakefs(faqs_df: pd.DataFrame, lakefs_endpoint: str, lakefs
     return LakeFSLoader(host=lakefs_endpoint).incremental_load(faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path, is_wordcloud=True)
 
 @task(name="encode tags")
-def encode_tags(tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
-    return XScraping().encode_tag_to_url(tags)
+def encode_tags(tags: dict[str, list[str]], combine: bool = False) -> dict[str, dict[str, str]]:
+    return XScraping().encode_tag_to_url(tags, combine=combine)
+
+@task(name="check sessions")
+async def check_sessions() -> list[Path]:
+    # Browser probes only run for sessions whose validation cache is stale
+    storage_states = []
+    for storage_state in discover_storage_states():
+        if await asyncio.to_thread(check_session, storage_state):
+            storage_states.append(storage_state)
+        else:
+            logger.warning(f"Skipping invalid X session {storage_state.name}")
+    return storage_states
 
-@task(name="flatten results")
-def flatten_results(nested_results: list[list[dict]]) -> list[dict]:
-    return [entry for result in nested_results for entry in result]
+@task(name="read spool", cache_policy=NO_CACHE)
+def read_spool(spool: ParquetSpool) -> pd.DataFrame:
+    return spool.read()
 
-@task(name="data to dataframe")
-def to_dataframe(tweets: list[dict]) -> pd.DataFrame:
-    return XScraping.to_dataframe(tweets)
+@task(name="annotate tags", cache_policy=NO_CACHE)
+def annotate_tags(tweet_index: TweetIndex, data: pd.DataFrame) -> pd.DataFrame:
+    return tweet_index.annotate(data)
 
 @task(name="validate dataframe")
 def validate_dataframe(data: pd.DataFrame) -> bool:
     validator = ValidationPydantic(TweetData)
-    return validator.validate(df=data, scrape_new=True)
+    return validator.validate_dataset(df=data, scrape_new=True)
 
 @task(name="load to lakefs")
 def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str = None) -> None:
     LakeFSLoader(host=lakefs_endpoint).incremental_load(data=data, lakefs_endpoint=lakefs_endpoint)
 
-@task(name="scrape tag")
-async def scrape_tag(category: str, tag: str, tag_url: str, max_scrolls: int) -> list[dict]:
-    return await XScraping().scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=max_scrolls)
+@task(name="scrape tag", cache_policy=NO_CACHE)
+async def scrape_tag(x_scraping: XScraping, spool: ParquetSpool, tag_stats: TagStatsStore, watermark_store: TagWatermarkStore, category: str, tag: str, tag_url: str, max_scrolls: int, extract_mode: str = "dom", pipeline: StagedLoadPipeline | None = None) -> bool:
+    validator = ValidationPydantic(TweetData)
+    rows_valid = True
+    tweets = 0
+    scrolls = 0
+    blocked = False
+    started = time.perf_counter()
+    query_tags = split_query(tag)
+
+    async def scrape_segment(url: str, segment_scrolls: int, watermark: int | None) -> bool:
+        nonlocal rows_valid, tweets, scrolls, blocked
+        async for batch in x_scraping.iter_tweets(category=category, tag=tag, tag_url=url, max_scrolls=segment_scrolls, extract_mode=extract_mode, watermark=watermark):
+            tag_stats.record_hashtags(tag, [record.tweetText for record in batch])
+            batch_df = XScraping.to_dataframe(batch)
+            if pipeline is not None:
+                # Validation and loading run in the pipeline stages, off the scrape lane
+                await pipeline.put(batch_df)
+                continue
+            rows_valid = validator.validate_rows(batch_df) and rows_valid
+            spool.write(batch_df)
+        scrolls += x_scraping.scroll_count
+        # Yield counts tweets already stored under another tag too, or shared tags would look idle
+        tweets += x_scraping.matched_count
+        blocked = blocked or x_scraping.stop_reason == "error"
+        return x_scraping.stop_reason in COMPLETE_STOPS
+
+    reached = await scrape_segment(tag_url, max_scrolls, watermark_store.get_many(query_tags))
+    gap_reached = None
+    gap = watermark_store.gap(query_tags)
+    # Newer tweets first; leftover scrolls backfill what an earlier trimmed run skipped
+    if reached and gap is not None and scrolls < max_scrolls:
+        floor, ceiling = gap
+        gap_reached = await scrape_segment(with_max_id(tag_url, ceiling - 1), max_scrolls - scrolls, floor)
+    watermark_store.mark_scrape(query_tags, reached, gap_reached)
+    tag_stats.record(tag, tweets=tweets, scrolls=scrolls, seconds=time.perf_counter() - started, blocked=blocked)
+    return rows_valid
+
+@task(name="advance watermarks", cache_policy=NO_CACHE)
+def advance_watermarks(watermark_store: TagWatermarkStore, data: pd.DataFrame) -> None:
+    watermark_store.advance(data)
 
 @task(name="check hash", log_prints=True)
 def check_hash_task(df: pd.DataFrame, lakefs_endpoint: str) -> bool:
     return LakeFSLoader(host=lakefs_endpoint).check_hash(df=df, lakefs_endpoint=lakefs_endpoint)
 
-async def scrape_flow():
-    tag_urls = encode_tags(tags)
-    semaphore = asyncio.Semaphore(3)
-    delay_seconds = 30
+async def scrape_flow(extract_mode: str = "dom", max_scrolls: int = 10, combine_tags: bool = False, time_budget_minutes: float = 12.0, activity_schedule: bool = True, archive_raw: bool = False, prefilter: str = "quarantine", start_interval_seconds: float = 5.0, tags_per_session: int = 3, pipelined: bool = False):
+    tag_urls = encode_tags(tags, combine=combine_tags)
+    watermark_store = TagWatermarkStore()
+    tag_stats = TagStatsStore()
+    tweet_index = TweetIndex()
+    raw_archive = RawArchive() if archive_raw else None
+    tweet_filter = TweetFilter(mode=prefilter) if prefilter != "off" else None
+    spool = ParquetSpool(SPOOL_DIR / f"incremental-{datetime.now():%Y%m%dT%H%M%S}")
     lakefs_endpoint = "http://lakefsdb:8000"
-
-    async def scrape_with_limit(category: str, tag: str, url: str):
-        async with semaphore:
-            return await scrape_tag(category=category, tag=tag, tag_url=url, max_scrolls=1)
-        
-    task_list = [
-        (category, tag, url)
-        for category, tag_url_dict in tag_urls.items()
-        for tag, url in tag_url_dict.items()
-    ]
-
-    all_results = []
-
-    for i in range(0, len(task_list), 3):
-        batch = task_list[i:i+3]
-        futures = [
-            scrape_with_limit(category, tag, url)
-            for category, tag, url in batch
-        ]
-        results = await asyncio.gather(*futures)
-        all_results.extend(results)
-
-        if i + 3 < len(task_list):
-            print(f"Completed batch {i//3 + 1}. Sleeping for {delay_seconds} seconds...")
-            await asyncio.sleep(delay_seconds)
-
-    all_tweets = flatten_results(all_results)
-    data = to_dataframe(all_tweets)
+    pipeline = StagedLoadPipeline(lakefs_endpoint=lakefs_endpoint, tweet_index=tweet_index, watermark_store=watermark_store) if pipelined else None
+
+    storage_states = await check_sessions()
+    if not storage_states:
+        print("No valid X session. Run x_login to log in again.")
+        return
+
+    # Concurrency is tags_per_session for each X account in the session pool
+    async with SessionPool(storage_states=storage_states, headless=True, tags_per_session=tags_per_session) as session_pool, pipeline or nullcontext():
+        concurrency = session_pool.concurrency
+        # Each freed slot takes the next tag right away; only page navigations are spaced
+        tag_scheduler = SlidingWindowScheduler(concurrency=concurrency, min_start_interval=start_interval_seconds)
+        # The budget leaves room for validation and the lakeFS load inside the 15-minute interval
+        scheduler = ScrollBudgetScheduler(tag_stats, time_budget=time_budget_minutes * 60, concurrency=concurrency, max_scrolls=max_scrolls)
+
+        async def scrape_with_limit(category: str, tag: str, url: str):
+            async with session_pool.session() as session:
+                tag_scrolls = scheduler.scrolls_for(tag)
+                if tag_scrolls == 0:
+                    return True
+                x_scraping = XScraping(browser_pool=session.browser_pool, rate_limiter=session.rate_limiter, block_resources=True, tweet_index=tweet_index, raw_archive=raw_archive, tweet_filter=tweet_filter, start_gate=tag_scheduler.wait_turn)
+                return await scrape_tag(x_scraping=x_scraping, spool=spool, tag_stats=tag_stats, watermark_store=watermark_store, category=category, tag=tag, tag_url=url, max_scrolls=tag_scrolls, extract_mode=extract_mode, pipeline=pipeline)
+
+        tag_lookup = {
+            tag: (category, url)
+            for category, tag_url_dict in tag_urls.items()
+            for tag, url in tag_url_dict.items()
+        }
+        due_tags = TagActivityPolicy(tag_stats).select(list(tag_lookup)) if activity_schedule else list(tag_lookup)
+        # Highest expected yield first, so a late run trims the low-yield tail
+        task_list = [(tag_lookup[tag][0], tag, tag_lookup[tag][1]) for tag in scheduler.plan(due_tags)]
+
+        all_results = await tag_scheduler.run(task_list, scrape_with_limit)
+
+    if tweet_filter is not None:
+        print(f"Prefilter {tweet_filter.summary()}")
+    tag_stats.end_run()
+    tag_stats.save()
+    if pipeline is not None:
+        # Everything was validated, classified and loaded by the pipeline stages
+        if pipeline.has_failures():
+            print("Some micro-batches were not loaded. Their tags will be scraped again next run.")
+        spool.clear()
+        return
+    data = read_spool(spool)
+    if data.empty:
+        print("No new tweets since the last watermark.")
+        spool.clear()
+        return
+    data = annotate_tags(tweet_index=tweet_index, data=data)
     check_hash_status = check_hash_task(df=data, lakefs_endpoint=lakefs_endpoint)
     if check_hash_status:
         print(f"Changes detected. Hash not matched.")
-        is_valid = validate_dataframe(data=data)
+        is_valid = validate_dataframe(data=data) and all(all_results)
         if is_valid:
             faqs_df = generate_wordcloud(df=data)
             load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+            advance_watermarks(watermark_store=watermark_store, data=data)
             load_wordcloud_to_lakefs(faqs_df=faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+            spool.clear()
         else:
             print("Validation failed, data not saved.")
     else:
         print(f"No changes detected. Hash matched.")
+        spool.clear()
 
 @flow(name="Incremental Scrape Flow", log_prints=True)
-def scrape_flow_wrapper():
-    asyncio.run(scrape_flow())
+def scrape_flow_wrapper(extract_mode: str = "dom", max_scrolls: int = 10, combine_tags: bool = False, time_budget_minutes: float = 12.0, activity_schedule: bool = True, archive_raw: bool = False, prefilter: str = "quarantine", start_interval_seconds: float = 5.0, tags_per_session: int = 3, pipelined: bool = False):
+    asyncio.run(scrape_flow(extract_mode=extract_mode, max_scrolls=max_scrolls, combine_tags=combine_tags, time_budget_minutes=time_budget_minutes, activity_schedule=activity_schedule, archive_raw=archive_raw, prefilter=prefilter, start_interval_seconds=start_interval_seconds, tags_per_session=tags_per_session, pipelined=pipelined))
 
 if __name__ == "__main__":
     # scrape_flow_wrapper()
@@ -1,20 +1,45 @@
 from prefect import flow, task
+from prefect.cache_policies import NO_CACHE
 import pandas as pd
 import os
 import asyncio
+from pathlib import Path
+from contextlib import nullcontext
 
 
 
 # Import XScraping for scraping
-from src.backend.scraping.x_scraping import XScraping
+from src.backend.scraping.x_scraping import XScraping, COMPLETE_STOPS
+# Import multi-account session pool
+from src.backend.scraping.session_pool import SessionPool, discover_storage_states
+# Import cached session validation
+from src.backend.scraping.x_login import check_session
+# Import per-tag watermarks
+from src.backend.scraping.watermark import TagWatermarkStore, parse_status_id
+# Import raw capture archive
+from src.backend.scraping.raw_archive import RawArchive
+# Import scrape-time relevance filter
+from src.backend.scraping.tweet_filter import TweetFilter
+# Import sliding-window tag scheduler
+from src.backend.scraping.tag_scheduler import SlidingWindowScheduler
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query, with_max_id
+# Import pipelined validate, classify and load stages
+from src.backend.pipeline.staged_load import StagedLoadPipeline
 # Import LakeFS loader
 from src.backend.load.lakefs_loader import LakeFSLoader
+# Import local batch spool
+from src.backend.load.spool import ParquetSpool
+# Import per-tag scrape checkpoints
+from src.backend.load.checkpoint import ScrapeCheckpoint
 # Import validation configuration
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import modern logging configuration
 from config.logging.modern_log import LoggingConfig
 # Import path configuration
-from config.path_config import tags, lakefs_s3_path_ml, repo_name_ml
+from config.path_config import tags, lakefs_s3_path_ml, repo_name_ml, SPOOL_DIR
 # Import wordcloud 
 from src.backend.ml.wordcloud import WordCloud
 
@@ -29,21 +54,32 @@ def load_wordcloud_to_lakefs(faqs_df: pd.DataFrame, lakefs_endpoint: str, lakefs
     return LakeFSLoader(host=lakefs_endpoint).load(faqs_df, lakefs_endpoint=lakefs_endpoint, repo_name=repo_name_ml,lakefs_s3_path=lakefs_s3_path)
 
 @task(name="encode tags")
-def encode_tags(tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
-    return XScraping().encode_tag_to_url(tags)
-
-@task(name="flatten results")
-def flatten_results(nested_results: list[list[dict]]) -> list[dict]:
-    return [entry for result in nested_results for entry in result]
-
-@task(name="data to dataframe")
-def to_dataframe(tweets: list[dict]) -> pd.DataFrame:
-    return XScraping.to_dataframe(tweets)
+def encode_tags(tags: dict[str, list[str]], combine: bool = False) -> dict[str, dict[str, str]]:
+    return XScraping().encode_tag_to_url(tags, combine=combine)
+
+@task(name="check sessions")
+async def check_sessions() -> list[Path]:
+    # Browser probes only run for sessions whose validation cache is stale
+    storage_states = []
+    for storage_state in discover_storage_states():
+        if await asyncio.to_thread(check_session, storage_state):
+            storage_states.append(storage_state)
+        else:
+            logger.warning(f"Skipping invalid X session {storage_state.name}")
+    return storage_states
+
+@task(name="read spool", cache_policy=NO_CACHE)
+def read_spool(spool: ParquetSpool) -> pd.DataFrame:
+    return spool.read()
+
+@task(name="annotate tags", cache_policy=NO_CACHE)
+def annotate_tags(tweet_index: TweetIndex, data: pd.DataFrame) -> pd.DataFrame:
+    return tweet_index.annotate(data)
 
 @task(name="validate dataframe")
 def validate_dataframe(data: pd.DataFrame) -> bool:
     validator = ValidationPydantic(TweetData)
-    return validator.validate(data)
+    return validator.validate_dataset(data)
 
 @task(name="save to csv")
 def save_to_csv(data: pd.DataFrame, path: str = "/root/flows/data/from_prefect/tweet_data.csv") -> None:
@@ -55,56 +91,113 @@ def save_to_csv(data: pd.DataFrame, path: str = "/root/flows/data/from_prefect/t
 def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str = None) -> None:
     LakeFSLoader(host=lakefs_endpoint).load(data=data, lakefs_endpoint=lakefs_endpoint)
 
-@task(name="scrape tag")
-async def scrape_tag(category: str, tag: str, tag_url: str) -> list[dict]:
+@task(name="scrape tag", cache_policy=NO_CACHE)
+async def scrape_tag(x_scraping: XScraping, spool: ParquetSpool, checkpoint: ScrapeCheckpoint, category: str, tag: str, tag_url: str, max_scrolls: int = 20, extract_mode: str = "dom", watermark: int | None = None, pipeline: StagedLoadPipeline | None = None) -> bool:
+    validator = ValidationPydantic(TweetData)
+    rows_valid = True
+    oldest_id, scrolls_done = checkpoint.resume_point(tag)
+    if oldest_id is not None:
+        logger.info(f"Resuming tag '{tag}' below status {oldest_id} after {scrolls_done} scrolls")
+        tag_url = with_max_id(tag_url, oldest_id - 1)
+        max_scrolls = max(1, max_scrolls - scrolls_done)
+    else:
+        scrolls_done = 0
     try:
-        return await XScraping().scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=20)
+        async for batch in x_scraping.iter_tweets(category=category, tag=tag, tag_url=tag_url, max_scrolls=max_scrolls, extract_mode=extract_mode, watermark=watermark):
+            batch_df = XScraping.to_dataframe(batch)
+            if pipeline is not None:
+                # Validation and loading run in the pipeline stages, off the scrape lane
+                await pipeline.put(batch_df)
+            else:
+                rows_valid = validator.validate_rows(batch_df) and rows_valid
+            # Spooled either way, since resuming a backfill relies on the spool and checkpoint
+            spool.write(batch_df)
+            status_ids = [status_id for status_id in map(parse_status_id, batch_df["tweet_link"]) if status_id is not None]
+            checkpoint.update(tag, oldest_id=min(status_ids, default=None), tweets=len(batch_df), scrolls=scrolls_done + x_scraping.scroll_count)
+        checkpoint.update(tag, oldest_id=None, tweets=0, scrolls=scrolls_done + x_scraping.scroll_count)
+        # A blocked page returns without raising; the tag stays partial so a restart resumes it
+        if x_scraping.stop_reason in COMPLETE_STOPS or x_scraping.stop_reason == "budget":
+            checkpoint.mark_done(tag)
+        else:
+            logger.warning(f"Tag '{tag}' stopped early ({x_scraping.stop_reason}); leaving it partial in the checkpoint")
+        return rows_valid
     except Exception as e:
         logger.error(f"[ERROR] Tag '{tag}' failed: {str(e)}")
         raise
 
+@task(name="advance watermarks", cache_policy=NO_CACHE)
+def advance_watermarks(watermark_store: TagWatermarkStore, data: pd.DataFrame) -> None:
+    watermark_store.advance(data)
+
 @task(name="upload hash")
 def unload_hash(df: pd.DataFrame, lakefs_endpoint: str) -> bool:
     return LakeFSLoader(host=lakefs_endpoint).load_hash(df=df, lakefs_endpoint=lakefs_endpoint)
 
 
 @flow(name="Initial Scrape Flow")
-async def scrape_flow():
-    tag_urls = encode_tags(tags)
-    semaphore = asyncio.Semaphore(3)
-    delay_seconds = 30
+async def scrape_flow(extract_mode: str = "dom", combine_tags: bool = False, archive_raw: bool = False, prefilter: str = "quarantine", start_interval_seconds: float = 5.0, tags_per_session: int = 3, pipelined: bool = False):
+    tag_urls = encode_tags(tags, combine=combine_tags)
+    watermark_store = TagWatermarkStore()
+    tweet_index = TweetIndex()
+    raw_archive = RawArchive() if archive_raw else None
+    tweet_filter = TweetFilter(mode=prefilter) if prefilter != "off" else None
+    # Fixed location so a restarted backfill picks up the previous run's spool
+    spool = ParquetSpool(SPOOL_DIR / "initial")
+    checkpoint = ScrapeCheckpoint(spool.root)
+    tweet_index.seed(read_spool(spool))
     lakefs_endpoint = "http://lakefsdb:8000"
-
-    async def scrape_with_limit(category: str, tag: str, url: str):
-        async with semaphore:
-            return await scrape_tag(category=category, tag=tag, tag_url=url)
-        
-    task_list = [
-        (category, tag, url)
-        for category, tag_url_dict in tag_urls.items()
-        for tag, url in tag_url_dict.items()
-    ]
-
-    all_results = []
-
-    for i in range(0, len(task_list), 3):
-        batch = task_list[i:i+3]
-        futures = [
-            scrape_with_limit(category, tag, url)
-            for category, tag, url in batch
+    pipeline = StagedLoadPipeline(lakefs_endpoint=lakefs_endpoint, tweet_index=tweet_index, watermark_store=watermark_store, incremental=False) if pipelined else None
+
+    storage_states = await check_sessions()
+    if not storage_states:
+        logger.error("No valid X session. Run x_login to log in again.")
+        return
+
+    # Concurrency is tags_per_session for each X account in the session pool
+    async with SessionPool(storage_states=storage_states, headless=True, tags_per_session=tags_per_session) as session_pool, pipeline or nullcontext():
+        concurrency = session_pool.concurrency
+        # Each freed slot takes the next tag right away; only page navigations are spaced
+        tag_scheduler = SlidingWindowScheduler(concurrency=concurrency, min_start_interval=start_interval_seconds)
+
+        async def scrape_with_limit(category: str, tag: str, url: str):
+            async with session_pool.session() as session:
+                x_scraping = XScraping(browser_pool=session.browser_pool, rate_limiter=session.rate_limiter, block_resources=True, tweet_index=tweet_index, raw_archive=raw_archive, tweet_filter=tweet_filter, start_gate=tag_scheduler.wait_turn)
+                return await scrape_tag(x_scraping=x_scraping, spool=spool, checkpoint=checkpoint, category=category, tag=tag, tag_url=url, extract_mode=extract_mode, watermark=watermark_store.get_many(split_query(tag)), pipeline=pipeline)
+
+        task_list = [
+            (category, tag, url)
+            for category, tag_url_dict in tag_urls.items()
+            for tag, url in tag_url_dict.items()
+            if not checkpoint.is_done(tag)
         ]
-        results = await asyncio.gather(*futures)
-        all_results.extend(results)
-
-        if i + 3 < len(task_list):
-            logger.info(f"Completed batch {i//3 + 1}. Sleeping for {delay_seconds} seconds...")
-            await asyncio.sleep(delay_seconds)
-
-    all_tweets = flatten_results(all_results)
-    data = to_dataframe(all_tweets)
+        skipped = sum(len(tag_url_dict) for tag_url_dict in tag_urls.values()) - len(task_list)
+        if skipped:
+            logger.info(f"Skipping {skipped} tags already finished in a previous run")
+
+        all_results = await tag_scheduler.run(task_list, scrape_with_limit)
+
+    if tweet_filter is not None:
+        logger.info(f"Prefilter {tweet_filter.summary()}")
+    data = read_spool(spool)
+    if data.empty:
+        logger.info("No new tweets since the last watermark.")
+        spool.clear()
+        return
+    data = annotate_tags(tweet_index=tweet_index, data=data)
     logger.info(f"Total tweets scraped: {len(data)}")
 
-    is_valid = validate_dataframe(data=data)
+    if pipeline is not None:
+        # Tweets and word cloud rows are already in lakeFS; only the CSV and hash cover the whole run
+        save_to_csv(data)
+        unload_hash(df=data, lakefs_endpoint=lakefs_endpoint)
+        # Reloading the spool would append the loaded micro-batches a second time. Failed
+        # tags kept their watermarks instead, so the incremental flow scrapes them again.
+        if pipeline.has_failures():
+            logger.warning("Some micro-batches were not loaded. Their tags will be scraped again by the incremental flow.")
+        spool.clear()
+        return
+
+    is_valid = validate_dataframe(data=data) and all(all_results)
     is_valid = True
     if is_valid:
         faqs_df = generate_wordcloud(df=data)
@@ -113,7 +206,9 @@ async def scrape_flow():
         save_to_csv(data)
         unload_hash(df=data, lakefs_endpoint=lakefs_endpoint)
         load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+        advance_watermarks(watermark_store=watermark_store, data=data)
         load_wordcloud_to_lakefs(faqs_df=faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+        spool.clear()
     else:
         logger.warning("Validation failed, data not saved.")
 
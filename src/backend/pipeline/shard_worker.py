@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import os
+import socket
+
+# Import XScraping for scraping
+from src.backend.scraping.x_scraping import XScraping
+# Import multi-account session pool
+from src.backend.scraping.session_pool import SessionPool, discover_storage_states
+# Import per-tag watermarks
+from src.backend.scraping.watermark import TagWatermarkStore
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import tag lease table
+from src.backend.scraping.tag_leases import TagLeaseTable
+# Import scrape-time relevance filter
+from src.backend.scraping.tweet_filter import TweetFilter
+# Import local batch spool
+from src.backend.load.spool import ParquetSpool
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import SPOOL_DIR
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+def shard_spool_dir(run_id: str):
+    return SPOOL_DIR / f"sharded-{run_id}"
+
+
+# One shard: its own event loop, browsers and accounts. Tags are claimed from the
+# lease table until none are left, and batches go to the run's shared spool.
+async def run_shard(run_id: str, shard_index: int = 0, shard_count: int = 1, extract_mode: str = "dom", max_scrolls: int = 10, prefilter: str = "quarantine") -> int:
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    leases = TagLeaseTable(run_id=run_id)
+    spool = ParquetSpool(shard_spool_dir(run_id))
+    watermark_store = TagWatermarkStore()
+    tweet_index = TweetIndex()
+    tweet_filter = TweetFilter(mode=prefilter) if prefilter != "off" else None
+    storage_states = discover_storage_states()
+    # Spread accounts over shards so two processes do not share one account's rate budget
+    shard_states = storage_states[shard_index::shard_count]
+    if not shard_states:
+        logger.warning(f"Shard {shard_index} has no account of its own. Sharing {storage_states[0].name}")
+        shard_states = storage_states[:1]
+    scraped = 0
+
+    async with SessionPool(storage_states=shard_states, headless=True, tags_per_session=3) as session_pool:
+
+        async def scrape_tag(category: str, tag: str, url: str) -> str:
+            async with session_pool.session() as session:
+                x_scraping = XScraping(browser_pool=session.browser_pool, rate_limiter=session.rate_limiter, block_resources=True, tweet_index=tweet_index, tweet_filter=tweet_filter)
+                async for batch in x_scraping.iter_tweets(category=category, tag=tag, tag_url=url, max_scrolls=max_scrolls, extract_mode=extract_mode, watermark=watermark_store.get_many(split_query(tag))):
+                    spool.write(XScraping.to_dataframe(batch))
+                return x_scraping.stop_reason
+
+        async def lane():
+            nonlocal scraped
+            # SQLite calls can wait on the database lock, so they run off the event loop
+            while (claim := await asyncio.to_thread(leases.claim, worker)) is not None:
+                category, tag, url = claim
+                ok = False
+                stop_reason = None
+                scrape = asyncio.create_task(scrape_tag(category, tag, url))
+                heartbeat = asyncio.create_task(leases.heartbeat(tag, worker))
+                try:
+                    await asyncio.wait([scrape, heartbeat], return_when=asyncio.FIRST_COMPLETED)
+                    if not scrape.done():
+                        # Lease lost: another worker may hold the tag now, so stop and leave the row to it
+                        scrape.cancel()
+                        await asyncio.gather(scrape, return_exceptions=True)
+                        logger.warning(f"Shard {shard_index} stopped scraping '{tag}' after losing its lease")
+                        continue
+                    stop_reason = scrape.result()
+                    # A blocked page returns without raising; it fails the tag instead of finishing it
+                    ok = stop_reason != "error"
+                    if ok:
+                        scraped += 1
+                    else:
+                        logger.error(f"[ERROR] Shard {shard_index} was blocked on tag '{tag}'")
+                except Exception as e:
+                    logger.error(f"[ERROR] Shard {shard_index} failed on tag '{tag}': {str(e)}")
+                finally:
+                    heartbeat.cancel()
+                    if not scrape.done():
+                        scrape.cancel()
+                await asyncio.to_thread(leases.complete, tag, worker, ok, stop_reason)
+
+        await asyncio.gather(*(lane() for _ in range(session_pool.concurrency)))
+
+    logger.info(f"Shard {shard_index} ({worker}) finished {scraped} tags")
+    if tweet_filter is not None:
+        logger.info(f"Shard {shard_index} prefilter {tweet_filter.summary()}")
+    return scraped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape tags claimed from a sharded run's lease table")
+    parser.add_argument("--run-id", required=True)
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--shard-count", type=int, default=1)
+    parser.add_argument("--extract-mode", default="dom")
+    parser.add_argument("--max-scrolls", type=int, default=10)
+    parser.add_argument("--prefilter", choices=("drop", "quarantine", "off"), default="quarantine")
+    args = parser.parse_args()
+
+    asyncio.run(run_shard(args.run_id, args.shard_index, args.shard_count, args.extract_mode, args.max_scrolls, args.prefilter))
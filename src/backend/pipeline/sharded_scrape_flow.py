@@ -0,0 +1,105 @@
+from prefect import flow
+import asyncio
+import sys
+from datetime import datetime
+
+# Import tasks shared with the incremental flow
+from src.backend.pipeline.incremental_scrape_flow import (
+    encode_tags, check_sessions, read_spool, annotate_tags, check_hash_task, validate_dataframe,
+    generate_wordcloud, load_to_lakefs, advance_watermarks, load_wordcloud_to_lakefs,
+)
+# Import shard worker spool location
+from src.backend.pipeline.shard_worker import shard_spool_dir
+# Import per-tag watermarks
+from src.backend.scraping.watermark import TagWatermarkStore
+# Import scrape stop reasons
+from src.backend.scraping.x_scraping import COMPLETE_STOPS
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import tag lease table
+from src.backend.scraping.tag_leases import TagLeaseTable
+# Import local batch spool
+from src.backend.load.spool import ParquetSpool
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import tags, lakefs_s3_path_ml, BASE_DIR
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+async def sharded_scrape(workers: int = 2, extract_mode: str = "dom", max_scrolls: int = 10, combine_tags: bool = False, prefilter: str = "quarantine"):
+    lakefs_endpoint = "http://lakefsdb:8000"
+    if not await check_sessions():
+        print("No valid X session. Run x_login to log in again.")
+        return
+
+    run_id = f"{datetime.now():%Y%m%dT%H%M%S}"
+    tag_urls = encode_tags(tags, combine=combine_tags)
+    leases = TagLeaseTable(run_id=run_id)
+    await asyncio.to_thread(leases.seed, [
+        (category, tag, url)
+        for category, tag_url_dict in tag_urls.items()
+        for tag, url in tag_url_dict.items()
+    ])
+
+    # Separate processes, so every shard has its own event loop and browsers.
+    # Workers in other containers can join with: python -m src.backend.pipeline.shard_worker --run-id <run_id>
+    processes = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "src.backend.pipeline.shard_worker",
+            "--run-id", run_id,
+            "--shard-index", str(i),
+            "--shard-count", str(workers),
+            "--extract-mode", extract_mode,
+            "--max-scrolls", str(max_scrolls),
+            "--prefilter", prefilter,
+            cwd=str(BASE_DIR),
+        )
+        for i in range(workers)
+    ]
+    exit_codes = await asyncio.gather(*(process.wait() for process in processes))
+    counts = leases.counts()
+    print(f"Shards exited with {exit_codes}. Tags: {counts}. Done per worker: {leases.workers()}")
+
+    spool = ParquetSpool(shard_spool_dir(run_id))
+    data = read_spool(spool)
+    if data.empty:
+        print("No new tweets since the last watermark.")
+        spool.clear()
+        return
+    # Shards dedup only within themselves; merge tags for tweets found by several shards
+    tweet_index = TweetIndex()
+    tweet_index.seed(data)
+    data = annotate_tags(tweet_index=tweet_index, data=data)
+    data = data.drop_duplicates(subset=["tweet_link"], ignore_index=True)
+
+    check_hash_status = check_hash_task(df=data, lakefs_endpoint=lakefs_endpoint)
+    if check_hash_status:
+        print(f"Changes detected. Hash not matched.")
+        # A tag still leased after every shard exited belonged to a crashed worker and may be half scraped
+        is_valid = validate_dataframe(data=data) and not counts.get("failed") and not counts.get("leased")
+        if is_valid:
+            faqs_df = generate_wordcloud(df=data)
+            load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+            # Tags the shards stopped early get a gap instead of jumping to their newest tweet
+            watermark_store = TagWatermarkStore()
+            for tag, stop_reason in leases.outcomes().items():
+                watermark_store.mark_scrape(split_query(tag), reached=stop_reason in COMPLETE_STOPS)
+            advance_watermarks(watermark_store=watermark_store, data=data)
+            load_wordcloud_to_lakefs(faqs_df=faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+            spool.clear()
+        else:
+            print("Validation failed, data not saved.")
+    else:
+        print(f"No changes detected. Hash matched.")
+        spool.clear()
+
+@flow(name="Sharded Scrape Flow", log_prints=True)
+def sharded_scrape_flow(workers: int = 2, extract_mode: str = "dom", max_scrolls: int = 10, combine_tags: bool = False, prefilter: str = "quarantine"):
+    asyncio.run(sharded_scrape(workers=workers, extract_mode=extract_mode, max_scrolls=max_scrolls, combine_tags=combine_tags, prefilter=prefilter))
+
+if __name__ == "__main__":
+    sharded_scrape_flow()
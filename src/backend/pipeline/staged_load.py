@@ -0,0 +1,210 @@
+import asyncio
+import time
+import pandas as pd
+
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import per-tag watermarks
+from src.backend.scraping.watermark import TagWatermarkStore
+# Import LakeFS loader
+from src.backend.load.lakefs_loader import LakeFSLoader
+# Import validation configuration
+from src.backend.validation.validate import ValidationPydantic, TweetData
+# Import wordcloud
+from src.backend.ml.wordcloud import WordCloud
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import lakefs_s3_path_ml, repo_name, repo_name_ml
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+# Ends a partial micro-batch once no batch has arrived for `flush_seconds`
+FLUSH = object()
+
+
+# Scrape -> validate -> classify -> load as concurrent stages joined by bounded
+# queues. Scrape lanes hand over each scrolled batch, validation runs as batches
+# arrive, and valid rows are classified and loaded in micro-batches of about
+# `batch_rows`, so the first tweets reach lakeFS while later tags are still
+# scraping. Full queues make the scrape lanes wait instead of buffering the run.
+# A micro-batch that fails a stage is not loaded, and its tags keep their old
+# watermark so the next run scrapes them again.
+class StagedLoadPipeline:
+    def __init__(
+        self,
+        lakefs_endpoint: str,
+        tweet_index: TweetIndex,
+        watermark_store: TagWatermarkStore,
+        incremental: bool = True,
+        batch_rows: int = 200,
+        flush_seconds: float = 60.0,
+        queue_size: int = 8,
+    ):
+        self.lakefs_endpoint = lakefs_endpoint
+        self.tweet_index = tweet_index
+        self.watermark_store = watermark_store
+        self.incremental = incremental
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.queue_size = queue_size
+
+        self.validator = ValidationPydantic(TweetData)
+        self.word_cloud: WordCloud | None = None
+        self.loader: LakeFSLoader | None = None
+        self.loaded: list[pd.DataFrame] = []
+        self.loaded_rows = 0
+        self.failed_tags: set[str] = set()
+        self.failed_batches = 0
+        self.untagged_failures = False
+        self.first_batch_at: float | None = None
+        self.first_load_seconds: float | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "StagedLoadPipeline":
+        self.scraped = asyncio.Queue(maxsize=self.queue_size)
+        self.validated = asyncio.Queue(maxsize=2)
+        self.classified = asyncio.Queue(maxsize=2)
+        self._tasks = [
+            asyncio.create_task(self._validate_stage()),
+            asyncio.create_task(self._classify_stage()),
+            asyncio.create_task(self._load_stage()),
+        ]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            return
+        # Drain: the end marker follows the last batch through every stage
+        await self.scraped.put(None)
+        await asyncio.gather(*self._tasks)
+        self.advance_watermarks()
+        logger.info(self.summary())
+
+    async def put(self, batch: pd.DataFrame) -> None:
+        if batch.empty:
+            return
+        if self.first_batch_at is None:
+            self.first_batch_at = time.monotonic()
+        # Stages only finish early if they crash; fail the scrape lane instead of blocking on a full queue
+        put = asyncio.ensure_future(self.scraped.put(batch))
+        done, _ = await asyncio.wait([put, *self._tasks], return_when=asyncio.FIRST_COMPLETED)
+        if put not in done:
+            put.cancel()
+            raise RuntimeError("A pipeline stage stopped; no more batches can be accepted")
+
+    @staticmethod
+    def batch_tags(batch: pd.DataFrame) -> set[str]:
+        tag_lists = batch["tags"].str.split(",") if "tags" in batch else batch["tag"].map(lambda tag: [tag])
+        return {tag for tag_list in tag_lists for tag in tag_list}
+
+    def fail_batch(self, batch: pd.DataFrame, reason: str) -> None:
+        self.failed_batches += 1
+        try:
+            tags = self.batch_tags(batch)
+        except Exception:
+            # Without its tags, no watermark can safely advance this run
+            tags = set()
+            self.untagged_failures = True
+        self.failed_tags |= tags
+        logger.error(f"Dropped batch of {len(batch)} rows for {sorted(tags)}: {reason}")
+
+    async def _validate_stage(self) -> None:
+        pending: list[pd.DataFrame] = []
+        pending_rows = 0
+        pending_since = 0.0
+        while True:
+            timeout = max(0.0, pending_since + self.flush_seconds - time.monotonic()) if pending else None
+            try:
+                batch = await asyncio.wait_for(self.scraped.get(), timeout)
+            except TimeoutError:
+                batch = FLUSH
+            if batch is not None and batch is not FLUSH:
+                try:
+                    rows_valid = await asyncio.to_thread(self.validator.validate_rows, batch)
+                except Exception as e:
+                    self.fail_batch(batch, f"validation error: {e}")
+                    rows_valid = None
+                if rows_valid:
+                    if not pending:
+                        pending_since = time.monotonic()
+                    pending.append(batch)
+                    pending_rows += len(batch)
+                elif rows_valid is not None:
+                    self.fail_batch(batch, "invalid rows")
+            if pending and (batch is None or batch is FLUSH or pending_rows >= self.batch_rows):
+                try:
+                    data = pd.concat(pending, ignore_index=True)
+                except Exception as e:
+                    for pending_batch in pending:
+                        self.fail_batch(pending_batch, f"could not combine micro-batch: {e}")
+                else:
+                    await self.validated.put(data)
+                pending, pending_rows = [], 0
+            if batch is None:
+                await self.validated.put(None)
+                return
+
+    async def _classify_stage(self) -> None:
+        while (data := await self.validated.get()) is not None:
+            try:
+                # Tags found by later lanes so far are merged in; rows keep the tags known at this point
+                data = self.tweet_index.annotate(data)
+                if self.word_cloud is None:
+                    self.word_cloud = WordCloud()
+                # classify() strips hashtags and drops rows in place, so it works on a copy
+                faqs_df = await asyncio.to_thread(self.word_cloud.classify, data.copy())
+            except Exception as e:
+                self.fail_batch(data, f"classification failed: {e}")
+                continue
+            await self.classified.put((data, faqs_df))
+        await self.classified.put(None)
+
+    def _load(self, data: pd.DataFrame, faqs_df: pd.DataFrame) -> None:
+        if self.loader is None:
+            # The loader restarts the lakeFS container when created, so it is created once
+            self.loader = LakeFSLoader(host=self.lakefs_endpoint)
+            if not self.incremental:
+                # Created once up front; micro-batches only append
+                self.loader.create_repository(repo_name)
+                self.loader.create_repository(repo_name_ml)
+        if self.incremental:
+            self.loader.incremental_load(data=data, lakefs_endpoint=self.lakefs_endpoint)
+            self.loader.incremental_load(faqs_df, lakefs_endpoint=self.lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml, is_wordcloud=True)
+        else:
+            # Append-only, without re-creating the repositories or reading the dataset back
+            self.loader.append(data, lakefs_endpoint=self.lakefs_endpoint)
+            self.loader.append(faqs_df, lakefs_endpoint=self.lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+
+    async def _load_stage(self) -> None:
+        while (item := await self.classified.get()) is not None:
+            data, faqs_df = item
+            try:
+                await asyncio.to_thread(self._load, data, faqs_df)
+                self.loaded.append(data[["tag", "tags", "tweet_link"]])
+            except Exception as e:
+                self.fail_batch(data, f"lakeFS load failed: {e}")
+                continue
+            if self.first_load_seconds is None and self.first_batch_at is not None:
+                self.first_load_seconds = time.monotonic() - self.first_batch_at
+            self.loaded_rows += len(data)
+            logger.info(f"Loaded micro-batch of {len(data)} tweets ({self.loaded_rows} this run)")
+
+    def advance_watermarks(self) -> None:
+        if not self.loaded or self.untagged_failures:
+            return
+        loaded = pd.concat(self.loaded, ignore_index=True)
+        # A tag with any failed micro-batch keeps its watermark, or its failed tweets would be skipped
+        keep = [not (set(tag_list) & self.failed_tags) for tag_list in loaded["tags"].str.split(",")]
+        self.watermark_store.advance(loaded[keep], exclude_tags=self.failed_tags)
+
+    def summary(self) -> str:
+        latency = f"{self.first_load_seconds:.1f}s" if self.first_load_seconds is not None else "n/a"
+        failed = f", {self.failed_batches} failed batches for tags {sorted(self.failed_tags)}" if self.failed_batches else ""
+        return f"Pipelined load: {self.loaded_rows} tweets in {len(self.loaded)} micro-batches, first tweet to lakeFS in {latency}{failed}"
+
+    def has_failures(self) -> bool:
+        return self.failed_batches > 0
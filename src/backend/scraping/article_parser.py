@@ -0,0 +1,118 @@
+from datetime import datetime
+from html.parser import HTMLParser
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Tracks one element by tag name and nesting depth, plus the text inside it
+class _Region:
+    def __init__(self):
+        self.tag: str | None = None
+        self.depth = 0
+        self.done = False
+
+    def enter(self, tag: str) -> None:
+        self.tag = tag
+        self.depth = 1
+
+    @property
+    def active(self) -> bool:
+        return self.depth > 0
+
+    def start(self, tag: str) -> None:
+        if self.active and tag == self.tag:
+            self.depth += 1
+
+    def end(self, tag: str) -> bool:
+        if self.active and tag == self.tag:
+            self.depth -= 1
+            if self.depth == 0:
+                self.done = True
+                return True
+        return False
+
+
+# Reads archived article HTML the way EXTRACT_ARTICLE_JS reads the live DOM: the
+# first User-Name block (links, spans, time) and the first tweetText block.
+class ArticleHtmlParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.user_name = _Region()
+        self.tweet_text = _Region()
+        self.links: list[str] = []
+        self.spans: list[list[str]] = []
+        self.open_spans: list[int] = []
+        self.datetime: str | None = None
+        self.text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        testid = attrs.get("data-testid")
+        if testid == "User-Name" and not (self.user_name.active or self.user_name.done):
+            self.user_name.enter(tag)
+            return
+        if testid == "tweetText" and not (self.tweet_text.active or self.tweet_text.done):
+            self.tweet_text.enter(tag)
+            return
+        self.user_name.start(tag)
+        self.tweet_text.start(tag)
+        if self.user_name.active:
+            if tag == "a":
+                self.links.append(attrs.get("href") or "")
+            elif tag == "span":
+                self.spans.append([])
+                self.open_spans.append(len(self.spans) - 1)
+            elif tag == "time" and self.datetime is None:
+                self.datetime = attrs.get("datetime")
+
+    def handle_endtag(self, tag):
+        if self.user_name.active and tag == "span" and self.open_spans:
+            self.open_spans.pop()
+        self.user_name.end(tag)
+        self.tweet_text.end(tag)
+
+    def handle_data(self, data):
+        if self.user_name.active:
+            for index in self.open_spans:
+                self.spans[index].append(data)
+        if self.tweet_text.active:
+            self.text.append(data)
+
+    def record(self) -> dict | None:
+        if len(self.links) <= 2 or len(self.spans) <= 3 or not self.datetime or not self.tweet_text.done:
+            return None
+        username = "".join(self.spans[2] if len(self.spans) == 4 else self.spans[3]).strip()
+        return {
+            "username": username,
+            "text": "".join(self.text).strip(),
+            "datetime": self.datetime,
+            "link": self.links[2],
+        }
+
+
+def parse_article_html(article_html: str) -> dict | None:
+    parser = ArticleHtmlParser()
+    parser.feed(article_html)
+    parser.close()
+    return parser.record()
+
+
+def parse_article_tweet(article_html: str) -> dict | None:
+    # Same fields and conversions as XScraping.add_article_records
+    record = parse_article_html(article_html)
+    if record is None or not (record["username"] and record["text"] and record["datetime"]):
+        return None
+    try:
+        post_time = datetime.strptime(record["datetime"], "%Y-%m-%dT%H:%M:%S.%fZ")
+    except ValueError as e:
+        logger.error(f"Invalid datetime format: {record['datetime']} | Error: {e}")
+        return None
+    return {
+        "username": record["username"],
+        "tweetText": record["text"],
+        "postTimeRaw": post_time,
+        "tweet_link": f"https://x.com{record['link']}",
+    }
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import inspect
+import time
+from datetime import datetime, timedelta
+from playwright.async_api import async_playwright
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import XScraping for scraping
+from src.backend.scraping.x_scraping import XScraping
+
+logger = LoggingConfig(level="INFO", level_console="INFO").get_logger()
+
+
+# Counts every awaited Playwright call made through the wrapped object, following
+# the handles it returns, so extractors can be compared by IPC round trips.
+class CountingProxy:
+    def __init__(self, target, counter: dict):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def counted(*args, **kwargs):
+            self._counter["calls"] += 1
+            return self._wrap(await attr(*args, **kwargs))
+
+        return counted
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if hasattr(value, "query_selector"):
+            return CountingProxy(value, self._counter)
+        return value
+
+
+def build_timeline_html(n_articles: int) -> str:
+    start = datetime(2025, 5, 1, 12, 0, 0)
+    articles = []
+    for i in range(n_articles):
+        posted = (start - timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        articles.append(f"""
+        <article>
+          <div data-testid="User-Name">
+            <a href="/user{i}"><span>User {i}</span><span>✓</span></a>
+            <a href="/user{i}"><span>@user{i}</span></a>
+            <span>·</span>
+            <a href="/user{i}/status/{10_000 + i}"><time datetime="{posted}">1m</time></a>
+          </div>
+          <div data-testid="tweetText"><span>benchmark tweet {i} #ธรรมศาสตร์ช้างเผือก</span></div>
+          <img src="data:," /><div role="group"><button>reply</button><button>like</button></div>
+        </article>""")
+    return f"<html><body><main>{''.join(articles)}</main></body></html>"
+
+
+async def benchmark_extractors(page, repeat: int) -> dict[str, dict[str, float]]:
+    x_scraping = XScraping()
+    results = {}
+    for mode in ("dom", "batch"):
+        counter = {"calls": 0}
+        counted_page = CountingProxy(page, counter)
+        elapsed = 0.0
+        extracted = 0
+        for _ in range(repeat):
+            entries = []
+            started = time.perf_counter()
+            if mode == "dom":
+                articles = await counted_page.query_selector_all("article")
+                await x_scraping.extract_articles("benchmark", "#benchmark", 0, articles, set(), entries)
+            else:
+                await x_scraping.extract_articles_batch("benchmark", "#benchmark", counted_page, set(), entries)
+            elapsed += time.perf_counter() - started
+            extracted = len(entries)
+        results[mode] = {
+            "tweets": extracted,
+            "ms_per_scroll": elapsed / repeat * 1000,
+            "calls_per_scroll": counter["calls"] / repeat,
+        }
+    return results
+
+
+async def run_benchmark(n_articles: int, repeat: int) -> dict[str, dict[str, float]]:
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_timeline_html(n_articles))
+        results = await benchmark_extractors(page, repeat)
+        await browser.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-element and batch article extraction on a synthetic timeline")
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.articles, args.repeat))
+    for mode, stats in results.items():
+        logger.info(
+            f"{mode:>5}: {stats['tweets']} tweets | {stats['ms_per_scroll']:.1f} ms/scroll | "
+            f"{stats['calls_per_scroll']:.0f} calls/scroll"
+        )
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import AUTH_TWITTER, BROWSER_SERVICE_PATH
+
+logger = LoggingConfig(level="DEBUG", level_console="DEBUG").get_logger()
+
+
+def service_endpoint(storage_state: str | Path) -> str | None:
+    try:
+        with open(BROWSER_SERVICE_PATH, encoding="utf-8") as f:
+            return json.load(f).get(Path(storage_state).name)
+    except (OSError, ValueError):
+        return None
+
+
+async def connect_or_launch(playwright, storage_state: str | Path, headless: bool = True, viewport: dict[str, int] | None = None):
+    # Returns (browser, context, remote). A remote context is the service's warm,
+    # logged-in profile and must be left open when the caller disconnects.
+    endpoint = service_endpoint(storage_state)
+    if endpoint is not None:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint, timeout=5000)
+            logger.debug(f"Connected to warm browser at {endpoint}")
+            return browser, browser.contexts[0], True
+        except Exception as e:
+            logger.warning(f"Browser service at {endpoint} unavailable, launching locally: {e}")
+    browser = await playwright.chromium.launch(headless=headless)
+    context = await browser.new_context(storage_state=storage_state, viewport=viewport or {"width": 1280, "height": 1024})
+    return browser, context, False
+
+
+class PooledBrowser:
+    def __init__(self, browser: Browser, context: BrowserContext, remote: bool = False):
+        self.browser = browser
+        self.context = context
+        self.remote = remote
+        self.active_pages = 0
+        self.uses = 0
+        self.retired = False
+
+    def is_healthy(self) -> bool:
+        return not self.retired and self.browser.is_connected()
+
+
+# Borrow pages with `async with pool.page() as page`. Each browser serves at most
+# `max_pages_per_browser` pages at once and is recycled after `recycle_after` pages.
+class BrowserPool:
+    def __init__(
+        self,
+        headless: bool = True,
+        storage_state: str | Path = AUTH_TWITTER,
+        max_browsers: int = 1,
+        max_pages_per_browser: int = 3,
+        recycle_after: int = 20,
+        viewport: dict[str, int] | None = None,
+        use_browser_service: bool = True,
+    ):
+        self.headless = headless
+        self.use_browser_service = use_browser_service
+        self.storage_state = storage_state
+        self.max_browsers = max_browsers
+        self.max_pages_per_browser = max_pages_per_browser
+        self.recycle_after = recycle_after
+        self.viewport = viewport or {"width": 1280, "height": 1024}
+
+        self._playwright = None
+        self._browsers: list[PooledBrowser] = []
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+            logger.info("Browser pool started")
+
+    async def close(self) -> None:
+        async with self._condition:
+            browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await self._close_browser(pooled)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            logger.info("Browser pool closed")
+
+    @asynccontextmanager
+    async def page(self):
+        pooled = await self._acquire()
+        page: Page | None = None
+        try:
+            try:
+                page = await pooled.context.new_page()
+                if pooled.remote:
+                    await page.set_viewport_size(self.viewport)
+            except Exception as e:
+                logger.warning(f"Pooled browser failed health check: {e}")
+                pooled.retired = True
+                raise
+            yield page
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close pooled page: {e}")
+            await self._release(pooled)
+
+    async def _acquire(self) -> PooledBrowser:
+        await self.start()
+        async with self._condition:
+            while True:
+                await self._evict_unhealthy()
+                candidates = [
+                    pooled for pooled in self._browsers
+                    if pooled.is_healthy() and pooled.active_pages < self.max_pages_per_browser
+                ]
+                if candidates:
+                    pooled = min(candidates, key=lambda b: b.active_pages)
+                elif len([b for b in self._browsers if not b.retired]) < self.max_browsers:
+                    pooled = await self._launch_browser()
+                    self._browsers.append(pooled)
+                else:
+                    await self._condition.wait()
+                    continue
+
+                pooled.active_pages += 1
+                pooled.uses += 1
+                if pooled.uses >= self.recycle_after:
+                    pooled.retired = True
+                return pooled
+
+    async def _release(self, pooled: PooledBrowser) -> None:
+        async with self._condition:
+            pooled.active_pages -= 1
+            if not pooled.is_healthy() and pooled.active_pages == 0:
+                if pooled in self._browsers:
+                    self._browsers.remove(pooled)
+                logger.debug(f"Recycling browser after {pooled.uses} uses")
+                await self._close_browser(pooled)
+            self._condition.notify_all()
+
+    async def _evict_unhealthy(self) -> None:
+        for pooled in list(self._browsers):
+            if not pooled.browser.is_connected():
+                logger.warning("Pooled browser disconnected. Removing from pool.")
+                pooled.retired = True
+            if pooled.retired and pooled.active_pages == 0:
+                self._browsers.remove(pooled)
+                await self._close_browser(pooled)
+
+    async def _launch_browser(self) -> PooledBrowser:
+        if self.use_browser_service:
+            browser, context, remote = await connect_or_launch(self._playwright, self.storage_state, headless=self.headless, viewport=self.viewport)
+        else:
+            browser = await self._playwright.chromium.launch(headless=self.headless)
+            context = await browser.new_context(
+                storage_state=self.storage_state,
+                viewport=self.viewport,
+            )
+            remote = False
+        logger.info(f"{'Connected' if remote else 'Launched'} pooled browser ({len(self._browsers) + 1}/{self.max_browsers})")
+        return PooledBrowser(browser=browser, context=context, remote=remote)
+
+    @staticmethod
+    async def _close_browser(pooled: PooledBrowser) -> None:
+        try:
+            # Disconnecting leaves the service's warm context and browser running
+            if not pooled.remote:
+                await pooled.context.close()
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Failed to close pooled browser: {e}")
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import BROWSER_SERVICE_PATH, BROWSER_PROFILE_DIR, BROWSER_SERVICE_PORT
+# Import multi-account session discovery
+from src.backend.scraping.session_pool import discover_storage_states
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+async def load_auth(context, storage_state: Path) -> None:
+    with open(storage_state, encoding="utf-8") as f:
+        cookies = json.load(f).get("cookies", [])
+    await context.clear_cookies()
+    await context.add_cookies(cookies)
+    logger.info(f"Loaded {len(cookies)} cookies from {storage_state.name}")
+
+
+# Long-lived Chromium per X account, started next to the worker. Python Playwright
+# has no launch_server, so each persistent context exposes the DevTools protocol and
+# flow runs attach with connect_over_cdp instead of cold-starting a browser.
+async def serve(headless: bool = True, refresh_seconds: float = 60.0) -> None:
+    storage_states = discover_storage_states()
+    async with async_playwright() as p:
+        endpoints = {}
+        contexts = {}
+        for i, storage_state in enumerate(storage_states):
+            port = BROWSER_SERVICE_PORT + i
+            context = await p.chromium.launch_persistent_context(
+                user_data_dir=str(BROWSER_PROFILE_DIR / storage_state.stem),
+                headless=headless,
+                viewport={"width": 1280, "height": 1024},
+                args=[f"--remote-debugging-port={port}"],
+            )
+            await load_auth(context, storage_state)
+            contexts[storage_state] = (context, os.path.getmtime(storage_state))
+            endpoints[storage_state.name] = f"http://localhost:{port}"
+
+        BROWSER_SERVICE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(BROWSER_SERVICE_PATH, "w", encoding="utf-8") as f:
+            json.dump(endpoints, f, indent=2)
+        logger.info(f"Browser service ready: {endpoints}")
+
+        try:
+            while True:
+                await asyncio.sleep(refresh_seconds)
+                # Pick up a fresh login from x_login without restarting the service
+                for storage_state, (context, mtime) in list(contexts.items()):
+                    if storage_state.exists() and os.path.getmtime(storage_state) != mtime:
+                        await load_auth(context, storage_state)
+                        contexts[storage_state] = (context, os.path.getmtime(storage_state))
+        finally:
+            BROWSER_SERVICE_PATH.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from playwright.async_api import Error as PlaywrightError
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+# X virtualises the timeline, so the article count alone can stay flat while new
+# tweets replace old ones. Count plus the last article's status link changes either way.
+TIMELINE_SIGNATURE_JS = """
+() => {
+    const articles = document.querySelectorAll("article");
+    const last = articles[articles.length - 1];
+    const link = last ? last.querySelector("a[href*='/status/']") : null;
+    return `${articles.length}|${link ? link.getAttribute("href") : ""}`;
+}
+"""
+TIMELINE_CHANGED_JS = f"(previous) => ({TIMELINE_SIGNATURE_JS})() !== previous"
+PAGE_GREW_JS = "(previous) => document.body.scrollHeight > previous"
+
+
+# Ends a post-scroll wait on the first real signal: the timeline changed, a
+# SearchTimeline request finished, or the network stayed idle for `idle_window`.
+class ContentWaiter:
+    def __init__(self, page, timeout: float = 8.0, idle_window: float = 0.5):
+        self.page = page
+        self.timeout = timeout
+        self.idle_window = idle_window
+        self.inflight = 0
+        self.last_activity = time.monotonic()
+        self.timeline_loaded = asyncio.Event()
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request) -> None:
+        self.inflight += 1
+        self.last_activity = time.monotonic()
+
+    def _on_request_done(self, request) -> None:
+        self.inflight = max(0, self.inflight - 1)
+        self.last_activity = time.monotonic()
+        if "/SearchTimeline" in request.url:
+            self.timeline_loaded.set()
+
+    async def signature(self) -> str:
+        return await self.page.evaluate(TIMELINE_SIGNATURE_JS)
+
+    async def wait(self, previous_signature: str) -> str:
+        self.timeline_loaded.clear()
+        # Idle only counts once the scroll has had a chance to start requests
+        self.last_activity = time.monotonic()
+        signals = {
+            asyncio.create_task(self._timeline_changed(previous_signature)): "articles",
+            asyncio.create_task(self.timeline_loaded.wait()): "timeline",
+            asyncio.create_task(self._network_idle()): "idle",
+        }
+        started = time.monotonic()
+        done, pending = await asyncio.wait(signals, timeout=self.timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        signal = next((signals[task] for task in done if task.result()), "timeout")
+        logger.debug(f"Scroll content wait ended on {signal} after {time.monotonic() - started:.2f}s")
+        return signal
+
+    async def wait_for_growth(self, previous_height: int) -> bool:
+        # Virtualisation swaps articles right after a scroll, so an early signal can come
+        # before the next SearchTimeline page is rendered. Only a grown page rules out the end.
+        try:
+            await self.page.wait_for_function(PAGE_GREW_JS, arg=previous_height, timeout=self.timeout * 1000)
+            return True
+        except PlaywrightError:
+            return False
+
+    async def _timeline_changed(self, previous_signature: str) -> bool:
+        try:
+            await self.page.wait_for_function(TIMELINE_CHANGED_JS, arg=previous_signature, timeout=self.timeout * 1000)
+            return True
+        except PlaywrightError:
+            return False
+
+    async def _network_idle(self) -> bool:
+        while True:
+            quiet_for = time.monotonic() - self.last_activity
+            if self.inflight == 0 and quiet_for >= self.idle_window:
+                return True
+            await asyncio.sleep(max(0.05, self.idle_window - quiet_for) if self.inflight == 0 else 0.1)
@@ -0,0 +1,52 @@
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+HEAP_USED_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+class PageMemory:
+    def __init__(self, page):
+        self.page = page
+        self.heap_mb: float | None = None
+        self.dom_nodes: int | None = None
+        self._cdp = None
+        self._cdp_failed = False
+
+    async def sample(self) -> float | None:
+        # CDP metrics are exact and include the DOM node count; performance.memory is
+        # the in-page fallback when no CDP session can be opened for this page
+        if not self._cdp_failed:
+            try:
+                if self._cdp is None:
+                    self._cdp = await self.page.context.new_cdp_session(self.page)
+                    await self._cdp.send("Performance.enable")
+                metrics = {m["name"]: m["value"] for m in (await self._cdp.send("Performance.getMetrics"))["metrics"]}
+                self.heap_mb = metrics["JSHeapUsedSize"] / 1024 / 1024
+                self.dom_nodes = int(metrics.get("Nodes", 0))
+                return self.heap_mb
+            except Exception as e:
+                logger.debug(f"CDP performance metrics unavailable, using performance.memory: {e}")
+                self._cdp_failed = True
+        used = await self.page.evaluate(HEAP_USED_JS)
+        self.heap_mb = used / 1024 / 1024 if used else None
+        return self.heap_mb
+
+    def summary(self) -> str:
+        heap = f"{self.heap_mb:.0f} MB heap" if self.heap_mb is not None else "heap n/a"
+        return f"{heap}, {self.dom_nodes} DOM nodes" if self.dom_nodes is not None else heap
+
+
+# Deep scrolls grow the timeline DOM and JS heap without bound, so a page is
+# replaced after `recycle_after_scrolls` scrolls or once its heap passes the cap.
+class PageRecyclePolicy:
+    def __init__(self, recycle_after_scrolls: int = 10, max_heap_mb: float = 256.0):
+        self.recycle_after_scrolls = recycle_after_scrolls
+        self.max_heap_mb = max_heap_mb
+
+    async def should_recycle(self, memory: PageMemory, scrolls: int) -> bool:
+        heap_mb = await memory.sample()
+        if scrolls >= self.recycle_after_scrolls:
+            return True
+        return heap_mb is not None and heap_mb > self.max_heap_mb
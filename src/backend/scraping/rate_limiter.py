@@ -0,0 +1,77 @@
+import asyncio
+import random
+import time
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Token bucket shared by every tag task of a run. The refill rate grows additively
+# while pages load cleanly and is cut multiplicatively (plus a global cooldown)
+# whenever X stops serving articles, so pacing follows what X currently tolerates.
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        rate: float = 0.25,
+        min_rate: float = 0.05,
+        max_rate: float = 1.0,
+        burst: int = 2,
+        additive_increase: float = 0.02,
+        multiplicative_decrease: float = 0.5,
+        block_cooldown: float = 60.0,
+        min_delay: float = 2.0,
+        jitter: float = 1.5,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.block_cooldown = block_cooldown
+        self.min_delay = min_delay
+        self.jitter = jitter
+
+        self.tokens = 0.0
+        self.cooldown_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Every caller waits at least the human-like floor, even with tokens to spare
+        floor = asyncio.create_task(asyncio.sleep(self.min_delay + random.uniform(0, self.jitter)))
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self.cooldown_until:
+                        await asyncio.sleep(self.cooldown_until - now)
+                        continue
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+            await floor
+        finally:
+            floor.cancel()
+
+    def on_success(self) -> None:
+        self._refill(time.monotonic())
+        self.rate = min(self.max_rate, self.rate + self.additive_increase)
+
+    def on_block(self) -> None:
+        self._refill(time.monotonic())
+        self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
+        self.tokens = 0.0
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + self.block_cooldown)
+        # No tokens accrue while cooling down
+        self._updated_at = self.cooldown_until
+        logger.warning(f"Blocking detected. Backing off to {self.rate:.3f} req/s for all tags, cooling down {self.block_cooldown:.0f}s")
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self._updated_at = max(now, self._updated_at)
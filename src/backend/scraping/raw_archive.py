@@ -0,0 +1,74 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import RAW_ARCHIVE_DIR
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+ARCHIVE_KINDS = ("timeline", "article")
+
+
+# Raw material the scraper parsed, stored as gzip blobs named by their SHA-256 under
+# <kind>/dt=YYYY-MM-DD/. Identical content captured again the same day (the same
+# article seen on the next scroll) is stored once. Each capture appends a line to
+# the partition's manifest.jsonl with the category, tag and time it was seen.
+class RawArchive:
+    def __init__(self, root: str | Path = RAW_ARCHIVE_DIR):
+        self.root = Path(root)
+        # Scrape lanes archive from worker threads; one writer at a time keeps blobs and manifests whole
+        self._lock = threading.Lock()
+
+    def partition(self, kind: str, day: str) -> Path:
+        return self.root / kind / f"dt={day}"
+
+    def put_many(self, kind: str, blobs: list[str | bytes], category: str, tag: str) -> int:
+        if kind not in ARCHIVE_KINDS:
+            raise ValueError(f"Unknown archive kind '{kind}'. Expected one of {ARCHIVE_KINDS}")
+        if not blobs:
+            return 0
+        now = datetime.now().replace(microsecond=0)
+        partition = self.partition(kind, now.strftime("%Y-%m-%d"))
+        written = 0
+        manifest = []
+        with self._lock:
+            for blob in blobs:
+                data = blob.encode("utf-8") if isinstance(blob, str) else blob
+                digest = hashlib.sha256(data).hexdigest()
+                blob_path = partition / digest[:2] / f"{digest}.gz"
+                if not blob_path.exists():
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = blob_path.with_suffix(".tmp")
+                    with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                        f.write(data)
+                    os.replace(tmp_path, blob_path)
+                    written += 1
+                manifest.append(json.dumps({"sha256": digest, "category": category, "tag": tag, "scraped_at": now.isoformat()}, ensure_ascii=False))
+            with open(partition / "manifest.jsonl", "a", encoding="utf-8") as f:
+                f.write("\n".join(manifest) + "\n")
+        logger.debug(f"Archived {len(blobs)} {kind} blobs ({written} new) - {tag}")
+        return written
+
+    def partitions(self, kind: str, start: str | None = None, end: str | None = None) -> list[Path]:
+        days = sorted((self.root / kind).glob("dt=*"))
+        return [
+            partition for partition in days
+            if (start is None or partition.name[3:] >= start) and (end is None or partition.name[3:] <= end)
+        ]
+
+    @staticmethod
+    def read_manifest(partition: Path) -> list[dict]:
+        with open(partition / "manifest.jsonl", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def read_blob(partition: Path, digest: str) -> bytes:
+        with gzip.open(partition / digest[:2] / f"{digest}.gz", "rb") as f:
+            return f.read()
@@ -0,0 +1,94 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import RAW_ARCHIVE_DIR, BASE_DIR
+# Import raw capture archive
+from src.backend.scraping.raw_archive import RawArchive, ARCHIVE_KINDS
+# Import timeline response parser
+from src.backend.scraping.timeline_parser import TimelineParser
+# Import archived article parsing
+from src.backend.scraping.article_parser import parse_article_tweet
+# Import compact tweet records
+from src.backend.scraping.tweet_record import TweetRecord, TweetRecordBuilder
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query, attribute_tags
+
+logger = LoggingConfig(level="INFO", level_console="INFO").get_logger()
+
+
+def parse_partition(root: str, kind: str, partition: str) -> list[TweetRecord]:
+    archive = RawArchive(root)
+    partition = Path(partition)
+    timeline_parser = TimelineParser()
+    records = []
+    seen = set()
+    for entry in archive.read_manifest(partition):
+        key = (entry["sha256"], entry["category"], entry["tag"])
+        if key in seen:
+            continue
+        seen.add(key)
+        blob = archive.read_blob(partition, entry["sha256"])
+        if kind == "timeline":
+            tweets = timeline_parser.parse(json.loads(blob))
+        else:
+            tweet = parse_article_tweet(blob.decode("utf-8"))
+            tweets = [tweet] if tweet else []
+        scraped_at = datetime.fromisoformat(entry["scraped_at"])
+        # Captures of a combined query are filed under the query; attribute each tweet
+        # to the hashtags it contains, as XScraping.attribute_batch does, one row per tag
+        query_tags = split_query(entry["tag"])
+        records.extend(
+            TweetRecord(
+                category=entry["category"],
+                tag=tag,
+                username=tweet["username"],
+                tweetText=tweet["tweetText"],
+                postTimeRaw=tweet["postTimeRaw"],
+                scrapeTime=scraped_at,
+                tweet_link=tweet["tweet_link"],
+            )
+            for tweet in tweets
+            for tag in (attribute_tags(tweet["tweetText"], query_tags) if len(query_tags) > 1 else [entry["tag"]])
+        )
+    return records
+
+
+# Rebuilds the tweet table from archived captures with the current parsers, one
+# process per date partition, so parsing changes apply to old data without X.
+def reparse(root: str | Path = RAW_ARCHIVE_DIR, kinds: tuple[str, ...] = ARCHIVE_KINDS, start: str | None = None, end: str | None = None, workers: int | None = None):
+    archive = RawArchive(root)
+    jobs = [(kind, partition) for kind in kinds for partition in archive.partitions(kind, start, end)]
+    builder = TweetRecordBuilder()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_partition, str(archive.root), kind, str(partition)) for kind, partition in jobs]
+        for (kind, partition), future in zip(jobs, futures):
+            records = future.result()
+            builder.extend(records)
+            logger.info(f"Parsed {len(records)} tweets from {kind}/{partition.name}")
+    data = builder.to_pandas()
+    # The same tweet is usually captured on several scrolls and runs; keep the first sighting
+    data = data.sort_values("scrapeTime").drop_duplicates(subset=["tweet_link", "tag"], keep="first", ignore_index=True)
+    logger.info(f"Rebuilt {len(data)} tweets from {len(jobs)} archive partitions")
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild tweet tables from the raw capture archive")
+    parser.add_argument("--root", default=str(RAW_ARCHIVE_DIR))
+    parser.add_argument("--kinds", nargs="+", choices=ARCHIVE_KINDS, default=list(ARCHIVE_KINDS))
+    parser.add_argument("--start", help="First day to include, YYYY-MM-DD")
+    parser.add_argument("--end", help="Last day to include, YYYY-MM-DD")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default=str(BASE_DIR / "data" / "from_prefect" / "reparsed_tweets.parquet"))
+    args = parser.parse_args()
+
+    data = reparse(args.root, tuple(args.kinds), args.start, args.end, args.workers)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    data.to_parquet(args.output, engine="pyarrow", index=False)
+    logger.info(f"Saved {len(data)} tweets to {args.output}")
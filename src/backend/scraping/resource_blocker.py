@@ -0,0 +1,122 @@
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+# Only text, usernames, timestamps and links are kept, so none of these are needed
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+BLOCKED_HOSTS = (
+    "video.twimg.com",
+    "ads-twitter.com",
+    "ads-api.x.com",
+    "analytics.twitter.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+)
+BLOCKED_PATHS = ("/jot/", "/client_event", "/live_pipeline/")
+# Typical transfer sizes on X, used until a block=False run has measured real ones
+ESTIMATED_BLOCKED_BYTES = {
+    "image": 40 * 1024,
+    "media": 512 * 1024,
+    "font": 60 * 1024,
+    "host": 8 * 1024,
+    "tracker": 2 * 1024,
+}
+
+
+class ResourceStats:
+    def __init__(self):
+        self.blocked = Counter()
+        self.saved_bytes = Counter()
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+        self.started_at = time.perf_counter()
+        self.load_seconds: float | None = None
+
+    def mark_loaded(self) -> None:
+        if self.load_seconds is None:
+            self.load_seconds = time.perf_counter() - self.started_at
+
+    def summary(self) -> str:
+        blocked = ", ".join(f"{kind}: {count}" for kind, count in self.blocked.most_common()) or "none"
+        load = f"{self.load_seconds:.1f}s" if self.load_seconds is not None else "n/a"
+        saved = ", ".join(f"{kind}: {size / 1024:.0f} KB" for kind, size in self.saved_bytes.most_common()) or "none"
+        return (
+            f"loaded {self.loaded_requests} requests / {self.loaded_bytes / 1024:.0f} KB, "
+            f"blocked {sum(self.blocked.values())} requests ({blocked}) saving ~{sum(self.saved_bytes.values()) / 1024:.0f} KB ({saved}), "
+            f"page load {load}"
+        )
+
+
+class ResourceBlocker:
+    def __init__(
+        self,
+        resource_types: tuple[str, ...] = BLOCKED_RESOURCE_TYPES,
+        hosts: tuple[str, ...] = BLOCKED_HOSTS,
+        paths: tuple[str, ...] = BLOCKED_PATHS,
+    ):
+        self.resource_types = set(resource_types)
+        self.hosts = hosts
+        self.paths = paths
+        # Bytes and count per block kind, measured on pages where blocking was off
+        self.measured_bytes = Counter()
+        self.measured_requests = Counter()
+
+    def should_block(self, resource_type: str, url: str) -> str | None:
+        if resource_type in self.resource_types:
+            return resource_type
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        if any(host == blocked or host.endswith(f".{blocked}") for blocked in self.hosts):
+            return "host"
+        if any(path in parsed.path for path in self.paths):
+            return "tracker"
+        return None
+
+    def estimated_bytes(self, kind: str) -> float:
+        if self.measured_requests[kind]:
+            return self.measured_bytes[kind] / self.measured_requests[kind]
+        return ESTIMATED_BLOCKED_BYTES.get(kind, 0)
+
+    # Aborted requests never report a size, so each blocked request is counted at the
+    # average size of its kind, as measured by block=False pages or the fixed estimates.
+    # Pass the previous stats to keep accumulating across the pages of one tag.
+    async def attach(self, page, block: bool = True, stats: ResourceStats | None = None) -> ResourceStats:
+        stats = stats or ResourceStats()
+
+        async def handle_route(route):
+            request = route.request
+            kind = self.should_block(request.resource_type, request.url)
+            if kind is None:
+                # Fall through to context routes (e.g. HAR replay) before the network
+                await route.fallback()
+                return
+            stats.blocked[kind] += 1
+            stats.saved_bytes[kind] += self.estimated_bytes(kind)
+            await route.abort("blockedbyclient")
+
+        async def on_request_finished(request):
+            # content-length is often missing on chunked or compressed responses;
+            # sizes() reports what was actually transferred
+            try:
+                sizes = await request.sizes()
+            except Exception as e:
+                logger.debug(f"No transfer size for {request.url}: {e}")
+                return
+            size = max(0, sizes["responseHeadersSize"]) + max(0, sizes["responseBodySize"])
+            stats.loaded_requests += 1
+            stats.loaded_bytes += size
+            kind = self.should_block(request.resource_type, request.url)
+            if kind is not None:
+                self.measured_requests[kind] += 1
+                self.measured_bytes[kind] += size
+
+        if block:
+            await page.route("**/*", handle_route)
+        page.on("requestfinished", on_request_finished)
+        return stats
@@ -0,0 +1,59 @@
+import math
+import time
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import per-tag yield history
+from src.backend.scraping.tag_stats import TagStatsStore
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Splits a run's time budget into per-tag scroll budgets. Every tag first gets its
+# initial page load in order of expected yield, then the remaining scroll-seconds
+# are shared in proportion to yield. Tags are re-checked against the deadline when
+# they start, so the low-yield tail is trimmed first when a run falls behind.
+class ScrollBudgetScheduler:
+    def __init__(self, stats: TagStatsStore, time_budget: float, concurrency: int, max_scrolls: int):
+        self.stats = stats
+        self.time_budget = time_budget
+        self.concurrency = concurrency
+        self.max_scrolls = max_scrolls
+        self.deadline = time.monotonic() + time_budget
+        self.budgets: dict[str, int] = {}
+
+    def plan(self, tags: list[str]) -> list[str]:
+        ordered = sorted(tags, key=self.stats.tweets_per_scroll, reverse=True)
+        capacity = self.time_budget * self.concurrency
+        budgets = {}
+        for tag in ordered:
+            cost = self.stats.seconds_per_scroll(tag)
+            if cost > capacity:
+                continue
+            budgets[tag] = 1
+            capacity -= cost
+
+        total_yield = sum(self.stats.tweets_per_scroll(tag) for tag in budgets)
+        if total_yield > 0:
+            shared = capacity
+            for tag in budgets:
+                share = shared * self.stats.tweets_per_scroll(tag) / total_yield
+                extra = min(self.max_scrolls - 1, math.floor(share / self.stats.seconds_per_scroll(tag)))
+                budgets[tag] += extra
+                capacity -= extra * self.stats.seconds_per_scroll(tag)
+
+        self.budgets = budgets
+        dropped = len(tags) - len(budgets)
+        logger.info(
+            f"Planned {sum(budgets.values())} scrolls for {len(budgets)} tags in {self.time_budget:.0f}s "
+            f"x {self.concurrency} workers ({dropped} tags dropped)"
+        )
+        return [tag for tag in ordered if tag in budgets]
+
+    def scrolls_for(self, tag: str) -> int:
+        remaining = self.deadline - time.monotonic()
+        fits = math.floor(remaining / self.stats.seconds_per_scroll(tag)) if remaining > 0 else 0
+        scrolls = min(self.budgets.get(tag, 0), fits)
+        if scrolls < self.budgets.get(tag, 0):
+            logger.info(f"Deadline in {max(0.0, remaining):.0f}s. Trimming {tag} to {scrolls} scrolls")
+        return scrolls
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import AUTH_TWITTER, AUTH_SESSIONS_DIR
+# Import shared browser pool
+from src.backend.scraping.browser_pool import BrowserPool
+# Import shared adaptive rate limiter
+from src.backend.scraping.rate_limiter import AdaptiveRateLimiter
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+def discover_storage_states(sessions_dir: str | Path = AUTH_SESSIONS_DIR) -> list[Path]:
+    # One storage_state JSON per X account; fall back to the single login session
+    # Validation markers left here by older runs are not accounts
+    storage_states = sorted(path for path in Path(sessions_dir).glob("*.json") if not path.name.endswith(".validated.json"))
+    return storage_states or [Path(AUTH_TWITTER)]
+
+
+class AuthSession:
+    def __init__(self, storage_state: Path, browser_pool: BrowserPool, rate_limiter: AdaptiveRateLimiter):
+        self.name = storage_state.stem
+        self.storage_state = storage_state
+        self.browser_pool = browser_pool
+        self.rate_limiter = rate_limiter
+        self.active_tags = 0
+        self.completed_tags = 0
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.rate_limiter.cooldown_until
+
+
+# Each account gets its own browser, rate budget and block cooldown, so a block on
+# one account only slows that account. Tags go to the least-loaded healthy session.
+class SessionPool:
+    def __init__(
+        self,
+        storage_states: list[Path] | None = None,
+        headless: bool = True,
+        tags_per_session: int = 3,
+    ):
+        self.tags_per_session = tags_per_session
+        self.sessions = [
+            AuthSession(
+                storage_state=Path(storage_state),
+                browser_pool=BrowserPool(headless=headless, storage_state=storage_state, max_pages_per_browser=tags_per_session),
+                rate_limiter=AdaptiveRateLimiter(),
+            )
+            for storage_state in (storage_states or discover_storage_states())
+        ]
+        self._condition = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return len(self.sessions) * self.tags_per_session
+
+    async def __aenter__(self) -> "SessionPool":
+        for session in self.sessions:
+            await session.browser_pool.start()
+        logger.info(f"Session pool started with {len(self.sessions)} accounts ({self.concurrency} concurrent tags)")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        for session in self.sessions:
+            await session.browser_pool.close()
+        logger.info(", ".join(f"{s.name}: {s.completed_tags} tags" for s in self.sessions))
+
+    @asynccontextmanager
+    async def session(self):
+        session = await self._acquire()
+        try:
+            yield session
+        finally:
+            async with self._condition:
+                session.active_tags -= 1
+                session.completed_tags += 1
+                self._condition.notify_all()
+
+    async def _acquire(self) -> AuthSession:
+        async with self._condition:
+            while True:
+                available = [s for s in self.sessions if s.active_tags < self.tags_per_session]
+                if available:
+                    break
+                await self._condition.wait()
+            healthy = [s for s in available if s.is_healthy()]
+            # When every free account is cooling down, take the one that recovers first
+            if healthy:
+                session = min(healthy, key=lambda s: (s.active_tags, s.completed_tags))
+            else:
+                session = min(available, key=lambda s: s.rate_limiter.cooldown_until)
+            session.active_tags += 1
+            logger.debug(f"Assigned tag to session {session.name} ({session.active_tags}/{self.tags_per_session} active)")
+            return session
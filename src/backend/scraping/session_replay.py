@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import AUTH_TWITTER, REPLAY_DIR
+# Import XScraping for scraping
+from src.backend.scraping.x_scraping import XScraping, EXTRACT_MODES
+# Import shared adaptive rate limiter
+from src.backend.scraping.rate_limiter import AdaptiveRateLimiter
+# Import call counting and extractor comparison
+from src.backend.scraping.benchmark_extract import CountingProxy, benchmark_extractors
+
+logger = LoggingConfig(level="INFO", level_console="INFO").get_logger()
+
+
+# Drop-in for BrowserPool. In record mode every page writes a HAR of the real search
+# session (bodies embedded); in replay mode pages are served from that HAR only and
+# anything missing is aborted, so a replay never reaches X.
+class HarSessionPool:
+    def __init__(
+        self,
+        har_path: str | Path,
+        record: bool = False,
+        headless: bool = True,
+        storage_state: str | Path = AUTH_TWITTER,
+        viewport: dict[str, int] | None = None,
+        wrap_page=None,
+    ):
+        self.har_path = Path(har_path)
+        self.record = record
+        self.headless = headless
+        self.storage_state = storage_state
+        self.viewport = viewport or {"width": 1280, "height": 1024}
+        self.wrap_page = wrap_page
+
+        self._playwright = None
+        self._browser = None
+
+    async def __aenter__(self) -> "HarSessionPool":
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._browser.close()
+        await self._playwright.stop()
+
+    @asynccontextmanager
+    async def page(self):
+        # Service workers would answer requests without going through routes
+        if self.record:
+            self.har_path.parent.mkdir(parents=True, exist_ok=True)
+            context = await self._browser.new_context(
+                storage_state=self.storage_state,
+                viewport=self.viewport,
+                service_workers="block",
+                record_har_path=str(self.har_path),
+                record_har_content="embed",
+            )
+        else:
+            context = await self._browser.new_context(viewport=self.viewport, service_workers="block")
+            await context.route_from_har(str(self.har_path), not_found="abort")
+        try:
+            page = await context.new_page()
+            yield self.wrap_page(page) if self.wrap_page else page
+        finally:
+            # The HAR is written when the recording context closes
+            await context.close()
+
+
+def replay_rate_limiter() -> AdaptiveRateLimiter:
+    # Replays are local, so pacing would only hide the scraper's own cost
+    return AdaptiveRateLimiter(rate=1000.0, max_rate=1000.0, burst=1000, min_delay=0.0, jitter=0.0)
+
+
+def session_meta_path(har_path: Path) -> Path:
+    return har_path.with_suffix(".json")
+
+
+async def record_session(category: str, tag: str, max_scrolls: int, har_path: str | Path | None = None, headless: bool = True) -> Path:
+    har_path = Path(har_path or REPLAY_DIR / f"session-{datetime.now():%Y%m%dT%H%M%S}.har")
+    tag_url = XScraping().encode_tag_to_url({category: [tag]})[category][tag]
+
+    async with HarSessionPool(har_path, record=True, headless=headless) as pool:
+        x_scraping = XScraping(browser_pool=pool, block_resources=True)
+        tweets = await x_scraping.scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=max_scrolls)
+
+    meta = {
+        "category": category,
+        "tag": tag,
+        "tag_url": tag_url,
+        "max_scrolls": max_scrolls,
+        "tweets": len(tweets),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(session_meta_path(har_path), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    logger.info(f"Recorded {len(tweets)} tweets over {max_scrolls} scrolls to {har_path}")
+    return har_path
+
+
+async def benchmark_session(har_path: str | Path, extract_modes: tuple[str, ...] = EXTRACT_MODES, repeat: int = 3) -> dict[str, dict[str, float]]:
+    har_path = Path(har_path)
+    with open(session_meta_path(har_path), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    results = {}
+    for mode in extract_modes:
+        counter = {"calls": 0}
+        tweets = scrolls = 0
+        elapsed = 0.0
+        for _ in range(repeat):
+            async with HarSessionPool(har_path, wrap_page=lambda page: CountingProxy(page, counter)) as pool:
+                x_scraping = XScraping(browser_pool=pool, rate_limiter=replay_rate_limiter(), block_resources=True)
+                started = time.perf_counter()
+                async for batch in x_scraping.iter_tweets(meta["category"], meta["tag"], meta["tag_url"], max_scrolls=meta["max_scrolls"], extract_mode=mode):
+                    tweets += len(batch)
+                elapsed += time.perf_counter() - started
+                # Scrolls that yield nothing (deduped, filtered or empty) still cost time
+                scrolls += x_scraping.scroll_count
+        results[f"scrape:{mode}"] = {
+            "tweets_per_sec": tweets / elapsed if elapsed else 0.0,
+            "calls_per_tweet": counter["calls"] / tweets if tweets else 0.0,
+            "ms_per_scroll": elapsed / scrolls * 1000 if scrolls else 0.0,
+        }
+
+    # Extractors alone, on the first replayed timeline page
+    async with HarSessionPool(har_path) as pool:
+        async with pool.page() as page:
+            await page.goto(meta["tag_url"])
+            if await XScraping().wait_for_articles_with_retry(page):
+                for mode, stats in (await benchmark_extractors(page, repeat)).items():
+                    results[f"extract:{mode}"] = {
+                        "tweets_per_sec": stats["tweets"] / (stats["ms_per_scroll"] / 1000) if stats["ms_per_scroll"] else 0.0,
+                        "calls_per_tweet": stats["calls_per_scroll"] / stats["tweets"] if stats["tweets"] else 0.0,
+                        "ms_per_scroll": stats["ms_per_scroll"],
+                    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record an X search session to a HAR, or benchmark the scraper against a recording")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record")
+    record_parser.add_argument("--category", required=True)
+    record_parser.add_argument("--tag", required=True)
+    record_parser.add_argument("--scrolls", type=int, default=5)
+    record_parser.add_argument("--har")
+    record_parser.add_argument("--show-browser", action="store_true")
+
+    benchmark_parser = subparsers.add_parser("benchmark")
+    benchmark_parser.add_argument("--har", required=True)
+    benchmark_parser.add_argument("--modes", nargs="+", choices=EXTRACT_MODES, default=list(EXTRACT_MODES))
+    benchmark_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record_session(args.category, args.tag, args.scrolls, har_path=args.har, headless=not args.show_browser))
+    else:
+        results = asyncio.run(benchmark_session(args.har, tuple(args.modes), repeat=args.repeat))
+        for name, stats in results.items():
+            logger.info(
+                f"{name:>16}: {stats['tweets_per_sec']:.1f} tweets/s | "
+                f"{stats['calls_per_tweet']:.2f} calls/tweet | {stats['ms_per_scroll']:.1f} ms/scroll"
+            )
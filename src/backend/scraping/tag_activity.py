@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import per-tag yield history
+from src.backend.scraping.tag_stats import TagStatsStore
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import split_query
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Hot tags (new tweets last run) are scraped every run. Each consecutive empty run
+# doubles a cold tag's interval up to `max_interval`. A cold tag is re-probed early
+# when it or one of the hashtags it usually appears with spiked in the last run.
+class TagActivityPolicy:
+    def __init__(self, stats: TagStatsStore, base_interval: timedelta = timedelta(minutes=15), max_interval: timedelta = timedelta(hours=24)):
+        self.stats = stats
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+
+    def interval(self, tag: str) -> timedelta:
+        return min(self.max_interval, self.base_interval * 2 ** self.stats.zero_runs(tag))
+
+    def schedule_slot(self, moment: datetime) -> datetime:
+        # Snap to the nearest flow run, so a scrape that started a few seconds into its
+        # run (or a run that fired slightly early) does not push the next due time back
+        # a whole interval each cycle
+        step = self.base_interval.total_seconds()
+        return datetime.fromtimestamp(round(moment.timestamp() / step) * step)
+
+    def due_reason(self, tag: str, now: datetime) -> str | None:
+        last_scraped = self.stats.last_scraped(tag)
+        if last_scraped is None:
+            return "new"
+        if self.stats.zero_runs(tag) == 0:
+            return "hot"
+        if self.schedule_slot(now) - self.schedule_slot(last_scraped) >= self.interval(tag):
+            return "cold schedule"
+        related = split_query(tag) + self.stats.cooccurring(tag)
+        if any(self.stats.is_spiking(hashtag) for hashtag in related):
+            return "related spike"
+        return None
+
+    def select(self, tags: list[str]) -> list[str]:
+        now = datetime.now()
+        due = {}
+        for tag in tags:
+            reason = self.due_reason(tag, now)
+            if reason is not None:
+                due[tag] = reason
+                logger.debug(f"Tag {tag} due ({reason})")
+        skipped = len(tags) - len(due)
+        logger.info(f"{len(due)} of {len(tags)} tags due this run ({skipped} cold tags skipped)")
+        return [tag for tag in tags if tag in due]
@@ -0,0 +1,136 @@
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import LEASE_DB_PATH
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+# Tags of one sharded run, claimed by worker processes through SQLite. A claim runs
+# under BEGIN IMMEDIATE, so two workers can never lease the same tag; a lease that
+# is not renewed before `lease_seconds` (worker crashed) can be claimed again.
+# The same table could live as a JSON object in lakeFS for workers on other hosts,
+# but SQLite on the shared state volume is enough for one Docker host.
+class TagLeaseTable:
+    def __init__(self, run_id: str, path: str | Path = LEASE_DB_PATH, lease_seconds: float = 600.0):
+        self.run_id = run_id
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tag_leases (
+                    run_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    stop_reason TEXT,
+                    PRIMARY KEY (run_id, tag)
+                )
+                """
+            )
+            # Tables created before scrape outcomes were stored
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tag_leases)")}
+            if "stop_reason" not in columns:
+                conn.execute("ALTER TABLE tag_leases ADD COLUMN stop_reason TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def seed(self, task_list: list[tuple[str, str, str]]) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO tag_leases (run_id, tag, category, url, status) VALUES (?, ?, ?, ?, ?)",
+                [(self.run_id, tag, category, url, PENDING) for category, tag, url in task_list],
+            )
+            conn.execute("COMMIT")
+        logger.info(f"Seeded {len(task_list)} tags for sharded run {self.run_id}")
+
+    def claim(self, worker: str) -> tuple[str, str, str] | None:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT category, tag, url FROM tag_leases
+                WHERE run_id = ? AND (status = ? OR (status = ? AND lease_until < ?))
+                ORDER BY attempts, rowid LIMIT 1
+                """,
+                (self.run_id, PENDING, LEASED, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE tag_leases SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1 WHERE run_id = ? AND tag = ?",
+                    (LEASED, worker, now + self.lease_seconds, self.run_id, row[1]),
+                )
+            conn.execute("COMMIT")
+        if row is not None:
+            logger.debug(f"Worker {worker} leased {row[1]}")
+        return row
+
+    def renew(self, tag: str, worker: str) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE tag_leases SET lease_until = ? WHERE run_id = ? AND tag = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_seconds, self.run_id, tag, worker, LEASED),
+            )
+        return cursor.rowcount > 0
+
+    async def heartbeat(self, tag: str, worker: str) -> None:
+        # Renews independently of scraping progress, so cooldowns and zero-yield scrolls
+        # cannot outlive the lease. Run as a task and cancel it when the tag is released;
+        # it returns once the lease is lost, so the caller can stop scraping the tag.
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.renew, tag, worker):
+                logger.warning(f"Worker {worker} lost its lease on {tag}")
+                return
+
+    def complete(self, tag: str, worker: str, ok: bool, stop_reason: str | None = None) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE tag_leases SET status = ?, lease_until = NULL, stop_reason = ? WHERE run_id = ? AND tag = ? AND worker = ?",
+                (DONE if ok else FAILED, stop_reason, self.run_id, tag, worker),
+            )
+
+    def outcomes(self) -> dict[str, str]:
+        # XScraping.stop_reason of every finished tag, for TagWatermarkStore.mark_scrape
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT tag, stop_reason FROM tag_leases WHERE run_id = ? AND status = ? AND stop_reason IS NOT NULL",
+                (self.run_id, DONE),
+            ).fetchall()
+        return dict(rows)
+
+    def counts(self) -> dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM tag_leases WHERE run_id = ? GROUP BY status",
+                (self.run_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def workers(self) -> dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT worker, COUNT(*) FROM tag_leases WHERE run_id = ? AND status = ? GROUP BY worker",
+                (self.run_id, DONE),
+            ).fetchall()
+        return dict(rows)
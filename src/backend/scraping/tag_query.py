@@ -0,0 +1,78 @@
+import re
+import urllib.parse
+import unicodedata
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+OR_SEPARATOR = " OR "
+# X rejects search queries longer than about 512 characters
+MAX_QUERY_LENGTH = 500
+# A query already bounded by with_max_id: "(<query>) max_id:<id>"
+MAX_ID_PATTERN = re.compile(r"^\((?P<query>.*)\) max_id:\d+$")
+# Thai vowels and tone marks are not \w, so the Thai block is listed explicitly
+HASHTAG_PATTERN = re.compile(r"#[\w\u0E00-\u0E7F]+")
+
+
+def build_or_queries(tag_list: list[str], max_length: int = MAX_QUERY_LENGTH) -> list[str]:
+    queries = []
+    current: list[str] = []
+    for tag in tag_list:
+        candidate = OR_SEPARATOR.join(current + [tag])
+        if current and len(candidate) > max_length:
+            queries.append(OR_SEPARATOR.join(current))
+            current = [tag]
+        else:
+            current.append(tag)
+        if len(tag) > max_length:
+            logger.warning(f"Tag longer than the query limit ({max_length}): {tag}")
+    if current:
+        queries.append(OR_SEPARATOR.join(current))
+    return queries
+
+
+def extract_hashtags(text: str) -> list[str]:
+    return [hashtag.casefold() for hashtag in HASHTAG_PATTERN.findall(text or "")]
+
+
+def split_query(query: str) -> list[str]:
+    return [tag for tag in query.split(OR_SEPARATOR) if tag]
+
+
+def _continues_tag(char: str) -> bool:
+    # Thai vowels and tone marks are combining marks, not alphanumerics
+    return char.isalnum() or char == "_" or unicodedata.category(char).startswith("M")
+
+
+def has_tag(text: str, tag: str) -> bool:
+    text = text.casefold()
+    tag = tag.casefold()
+    start = text.find(tag)
+    while start != -1:
+        end = start + len(tag)
+        if end == len(text) or not _continues_tag(text[end]):
+            return True
+        start = text.find(tag, start + 1)
+    return False
+
+
+# A combined query returns tweets for any of its tags, so each tweet is attributed
+# to the tags that appear in its text. Tweets matching none (the hashtag was only in
+# a quoted tweet or the author's name) fall back to the first tag of the query.
+def attribute_tags(text: str, tags: list[str]) -> list[str]:
+    matched = [tag for tag in tags if has_tag(text or "", tag)]
+    return matched or tags[:1]
+
+
+def with_max_id(tag_url: str, max_id: int) -> str:
+    # Live search is newest-first, so max_id resumes just below the oldest tweet seen
+    parsed = urllib.parse.urlsplit(tag_url)
+    params = urllib.parse.parse_qs(parsed.query)
+    query = params["q"][0]
+    if match := MAX_ID_PATTERN.match(query):
+        query = match["query"]
+    # AND binds tighter than OR, so without parentheses max_id would bound only the last tag
+    params["q"] = [f"({query}) max_id:{max_id}"]
+    return urllib.parse.urlunsplit(parsed._replace(query=urllib.parse.urlencode(params, doseq=True, quote_via=urllib.parse.quote)))
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+
+# Runs tag jobs on `concurrency` lanes that each take the next job as soon as their
+# current one finishes, so one slow tag never holds idle slots. Page starts across
+# all lanes are spaced by at least `min_start_interval` seconds: workers await
+# `wait_turn` right before navigating (XScraping's start_gate), so jobs that return
+# without opening a page never use up a slot.
+class SlidingWindowScheduler:
+    def __init__(self, concurrency: int, min_start_interval: float = 5.0):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.concurrency = concurrency
+        self.min_start_interval = min_start_interval
+        self._last_start = float("-inf")
+        self._start_lock = asyncio.Lock()
+
+    async def wait_turn(self) -> None:
+        async with self._start_lock:
+            delay = self._last_start + self.min_start_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_start = time.monotonic()
+
+    async def run(self, jobs: list[tuple], worker) -> list:
+        # Results keep the order of `jobs`, like asyncio.gather
+        results = [None] * len(jobs)
+        pending = iter(enumerate(jobs))
+        completed = 0
+        started = time.monotonic()
+
+        async def lane():
+            nonlocal completed
+            for index, job in pending:
+                results[index] = await worker(*job)
+                completed += 1
+                logger.info(f"Completed {completed}/{len(jobs)} tags ({time.monotonic() - started:.0f}s)")
+
+        lanes = [asyncio.create_task(lane()) for _ in range(min(self.concurrency, len(jobs)))]
+        try:
+            await asyncio.gather(*lanes)
+        except BaseException:
+            # A failed tag stops the run, as a failed gather did; do not leave lanes scraping
+            for task in lanes:
+                task.cancel()
+            await asyncio.gather(*lanes, return_exceptions=True)
+            raise
+        return results
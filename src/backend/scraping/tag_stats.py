@@ -0,0 +1,127 @@
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import TAG_STATS_PATH
+# Import hashtag extraction
+from src.backend.scraping.tag_query import extract_hashtags, split_query
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+# Priors for tags without history: optimistic yield so new tags are scraped at least once
+DEFAULT_TWEETS_PER_SCROLL = 1.0
+DEFAULT_SECONDS_PER_SCROLL = 6.0
+TOP_COOCCURRING = 20
+
+
+# Per-tag yield history across runs, smoothed with an exponential moving average so
+# one quiet or noisy run does not swing the schedule. Hashtag counts seen in each
+# run are kept too, so a spike in related hashtags can wake up a cold tag.
+class TagStatsStore:
+    def __init__(self, path: str | Path = TAG_STATS_PATH, history: int = 20, alpha: float = 0.3, spike_factor: float = 3.0, spike_min: int = 3):
+        self.path = Path(path)
+        self.history = history
+        self.alpha = alpha
+        self.spike_factor = spike_factor
+        self.spike_min = spike_min
+        self.stats, self.hashtags = self._read()
+        self.run_hashtags = Counter()
+        self.run_cooccurring: dict[str, Counter] = {}
+
+    def tweets_per_scroll(self, tag: str) -> float:
+        return self.stats.get(tag, {}).get("tweets_per_scroll", DEFAULT_TWEETS_PER_SCROLL)
+
+    def seconds_per_scroll(self, tag: str) -> float:
+        return self.stats.get(tag, {}).get("seconds_per_scroll", DEFAULT_SECONDS_PER_SCROLL)
+
+    def zero_runs(self, tag: str) -> int:
+        return self.stats.get(tag, {}).get("zero_runs", 0)
+
+    def last_scraped(self, tag: str) -> datetime | None:
+        # Blocked runs do not count, so the tag is retried on its normal schedule
+        history = [run for run in self.stats.get(tag, {}).get("history", []) if not run.get("blocked")]
+        return datetime.fromisoformat(history[-1]["at"]) if history else None
+
+    def cooccurring(self, tag: str) -> list[str]:
+        return list(self.stats.get(tag, {}).get("cooccurring", {}))
+
+    def is_spiking(self, hashtag: str) -> bool:
+        return self.hashtags.get(hashtag.casefold(), {}).get("spiking", False)
+
+    def record(self, tag: str, tweets: int, scrolls: int, seconds: float, blocked: bool = False) -> None:
+        # A blocked scrape says nothing about the tag's yield, so it cannot make the tag go cold
+        entry = self.stats.setdefault(tag, {"history": []})
+        if scrolls > 0:
+            if not blocked:
+                entry["tweets_per_scroll"] = self._smooth(entry.get("tweets_per_scroll"), tweets / scrolls)
+            entry["seconds_per_scroll"] = self._smooth(entry.get("seconds_per_scroll"), seconds / scrolls)
+        if tweets:
+            entry["zero_runs"] = 0
+        elif not blocked:
+            entry["zero_runs"] = entry.get("zero_runs", 0) + 1
+        run = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "tweets": tweets,
+            "scrolls": scrolls,
+            "seconds": round(seconds, 1),
+        }
+        if blocked:
+            run["blocked"] = True
+        entry["history"] = (entry["history"] + [run])[-self.history:]
+
+    def record_hashtags(self, tag: str, texts: list[str]) -> None:
+        own = {query_tag.casefold() for query_tag in split_query(tag)}
+        cooccurring = self.run_cooccurring.setdefault(tag, Counter())
+        for text in texts:
+            hashtags = set(extract_hashtags(text))
+            self.run_hashtags.update(hashtags)
+            cooccurring.update(hashtags - own)
+
+    def end_run(self) -> None:
+        for hashtag in set(self.hashtags) | set(self.run_hashtags):
+            entry = self.hashtags.setdefault(hashtag, {"average": 0.0})
+            count = self.run_hashtags.get(hashtag, 0)
+            entry["spiking"] = count >= self.spike_min and count > self.spike_factor * entry["average"]
+            entry["average"] = self._smooth(entry["average"], count)
+            if entry["average"] < 0.01 and not count:
+                del self.hashtags[hashtag]
+        for tag, counts in self.run_cooccurring.items():
+            entry = self.stats.setdefault(tag, {"history": []})
+            decayed = Counter({hashtag: count * (1 - self.alpha) for hashtag, count in entry.get("cooccurring", {}).items()})
+            decayed.update(counts)
+            entry["cooccurring"] = {hashtag: round(count, 2) for hashtag, count in decayed.most_common(TOP_COOCCURRING)}
+        spiking = [hashtag for hashtag, entry in self.hashtags.items() if entry["spiking"]]
+        if spiking:
+            logger.info(f"Hashtags spiking this run: {', '.join(spiking[:10])}")
+        self.run_hashtags.clear()
+        self.run_cooccurring.clear()
+
+    def _smooth(self, previous: float | None, value: float) -> float:
+        return value if previous is None else self.alpha * value + (1 - self.alpha) * previous
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tags": self.stats, "hashtags": self.hashtags}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved yield stats for {len(self.stats)} tags to {self.path}")
+
+    def _read(self) -> tuple[dict[str, dict], dict[str, dict]]:
+        if not self.path.exists():
+            return {}, {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tag stats {self.path}: {e}")
+            return {}, {}
+        # Files written before hashtag tracking hold the tag stats at the top level
+        if "tags" not in data:
+            return data, {}
+        return data["tags"], data.get("hashtags", {})
@@ -0,0 +1,72 @@
+import html
+from datetime import datetime, timezone
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="DEBUG").get_logger()
+
+TIMELINE_ENDPOINTS = ("SearchTimeline",)
+CREATED_AT_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+class TimelineParser:
+    @staticmethod
+    def is_timeline_response(url: str) -> bool:
+        return any(f"/{endpoint}" in url for endpoint in TIMELINE_ENDPOINTS)
+
+    def parse(self, payload: dict) -> list[dict]:
+        tweets = []
+        for result in self._iter_tweet_results(payload):
+            tweet = self.parse_tweet(result)
+            if tweet:
+                tweets.append(tweet)
+        return tweets
+
+    def parse_tweet(self, result: dict) -> dict | None:
+        # Tweets with limited visibility wrap the real tweet one level deeper
+        if result.get("__typename") == "TweetWithVisibilityResults":
+            result = result.get("tweet", {})
+        if result.get("__typename") not in (None, "Tweet"):
+            return None
+
+        legacy = result.get("legacy") or {}
+        tweet_id = result.get("rest_id") or legacy.get("id_str")
+        created_at = legacy.get("created_at")
+        screen_name = self._screen_name(result)
+        if not (tweet_id and created_at and screen_name):
+            return None
+
+        # Long posts keep their untruncated text in note_tweet
+        note = (((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {})
+        text = note.get("text") or legacy.get("full_text") or ""
+        text = html.unescape(text).strip()
+        if not text:
+            return None
+
+        post_time = datetime.strptime(created_at, CREATED_AT_FORMAT).astimezone(timezone.utc).replace(tzinfo=None)
+        return {
+            "tweet_id": int(tweet_id),
+            "username": f"@{screen_name}",
+            "tweetText": text,
+            "postTimeRaw": post_time,
+            "tweet_link": f"https://x.com/{screen_name}/status/{tweet_id}",
+        }
+
+    @staticmethod
+    def _screen_name(result: dict) -> str | None:
+        user = (((result.get("core") or {}).get("user_results") or {}).get("result") or {})
+        # Newer payloads moved screen_name from user.legacy to user.core
+        return (user.get("core") or {}).get("screen_name") or (user.get("legacy") or {}).get("screen_name")
+
+    def _iter_tweet_results(self, node):
+        if isinstance(node, dict):
+            tweet_results = node.get("tweet_results")
+            if isinstance(tweet_results, dict) and isinstance(tweet_results.get("result"), dict):
+                yield tweet_results["result"]
+                return
+            for value in node.values():
+                yield from self._iter_tweet_results(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from self._iter_tweet_results(value)
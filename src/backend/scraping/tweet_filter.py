@@ -0,0 +1,108 @@
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import QUARANTINE_DIR, tag_filter_rules
+# Import local batch spool
+from src.backend.load.spool import ParquetSpool
+# Import compact tweet records
+from src.backend.scraping.tweet_record import TweetRecord, TweetRecordBuilder
+# Import hashtag matching
+from src.backend.scraping.tag_query import has_tag
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+FILTER_MODES = ("drop", "quarantine")
+# Same post-time floor as TweetData.validate_post_time
+DEFAULT_FILTER_RULE = {
+    "scripts": ("thai", "latin"),
+    "min_post_time": datetime(2020, 1, 1),
+    "require_tag": False,
+}
+# Links and mentions say nothing about the language of the tweet itself
+NON_TEXT_PATTERN = re.compile(r"https?://\S+|@[\w\u0E00-\u0E7F]+")
+# Hashtags only count when the tweet has no other text
+HASHTAG_PATTERN = re.compile(r"#[\w\u0E00-\u0E7F]+")
+# Thai tweets often mix in English words, so a modest Thai share is enough
+THAI_SHARE = 0.2
+
+
+def script_counts(text: str) -> Counter:
+    counts = Counter()
+    for char in text:
+        if "\u0E00" <= char <= "\u0E7F":
+            counts["thai"] += 1
+        elif char.isalpha():
+            counts["latin" if unicodedata.name(char, "").startswith("LATIN") else "other"] += 1
+    return counts
+
+
+def dominant_script(text: str) -> str:
+    text = NON_TEXT_PATTERN.sub(" ", text)
+    counts = script_counts(HASHTAG_PATTERN.sub(" ", text))
+    if not counts:
+        # A tweet of just hashtags plus an image or link is judged by its hashtags
+        counts = script_counts(" ".join(HASHTAG_PATTERN.findall(text)))
+    letters = sum(counts.values())
+    if not letters:
+        return "none"
+    if counts["thai"] / letters >= THAI_SHARE:
+        return "thai"
+    return "latin" if counts["latin"] >= counts["other"] else "other"
+
+
+# Cheap relevance checks run on each scroll's records before they are validated,
+# spooled, hashed or classified. Rejected tweets are dropped or, in quarantine
+# mode, kept aside with the reason so rules can be reviewed.
+class TweetFilter:
+    def __init__(self, mode: str = "quarantine", rules: dict[str, dict] | None = None, quarantine_dir=QUARANTINE_DIR):
+        if mode not in FILTER_MODES:
+            raise ValueError(f"Unknown filter mode '{mode}'. Expected one of {FILTER_MODES}")
+        self.mode = mode
+        self.rules = tag_filter_rules if rules is None else rules
+        self.quarantine = ParquetSpool(quarantine_dir / f"dt={datetime.now():%Y-%m-%d}") if mode == "quarantine" else None
+        self.rejected = Counter()
+
+    def rule_for(self, tag: str) -> dict:
+        rule = {**DEFAULT_FILTER_RULE, **self.rules.get(tag, {})}
+        if isinstance(rule["min_post_time"], str):
+            rule["min_post_time"] = datetime.fromisoformat(rule["min_post_time"])
+        return rule
+
+    def reject_reason(self, record: TweetRecord) -> str | None:
+        rule = self.rule_for(record.tag)
+        if record.postTimeRaw < rule["min_post_time"]:
+            return "post_time"
+        script = dominant_script(record.tweetText)
+        if script not in rule["scripts"]:
+            return f"script:{script}"
+        if rule["require_tag"] and not has_tag(record.tweetText, record.tag):
+            return "missing_tag"
+        return None
+
+    def keep_mask(self, records: list[TweetRecord]) -> list[bool]:
+        keep = []
+        rejected = []
+        reasons = []
+        for record in records:
+            reason = self.reject_reason(record)
+            keep.append(reason is None)
+            if reason is not None:
+                rejected.append(record)
+                reasons.append(reason)
+                self.rejected[reason] += 1
+        if rejected:
+            logger.debug(f"Prefilter rejected {len(rejected)}/{len(records)} tweets: {dict(Counter(reasons))}")
+            if self.quarantine is not None:
+                data = TweetRecordBuilder().extend(rejected).to_pandas()
+                data["filter_reason"] = reasons
+                self.quarantine.write(data)
+        return keep
+
+    def summary(self) -> str:
+        rejected = ", ".join(f"{reason}: {count}" for reason, count in self.rejected.most_common()) or "none"
+        return f"{self.mode} {sum(self.rejected.values())} tweets ({rejected})"
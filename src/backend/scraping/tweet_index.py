@@ -0,0 +1,72 @@
+import pandas as pd
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import status ID parsing
+from src.backend.scraping.watermark import parse_status_id
+# Import compact tweet records
+from src.backend.scraping.tweet_record import TweetRecord
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+TAG_SEPARATOR = ","
+
+
+# Run-scoped dedup index shared by every tag task. A tweet found under several
+# hashtags is stored once; the extra tags and categories are remembered here and
+# written to the `tags` / `categories` columns by annotate().
+class TweetIndex:
+    def __init__(self):
+        self.tags: dict[int | tuple[str, str], list[str]] = {}
+        self.categories: dict[int | tuple[str, str], list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    @staticmethod
+    def key(username: str, tweetText: str, tweet_link: str) -> int | tuple[str, str]:
+        status_id = parse_status_id(tweet_link)
+        return status_id if status_id is not None else (username, tweetText)
+
+    def add(self, record: TweetRecord) -> bool:
+        key = self.key(record.username, record.tweetText, record.tweet_link)
+        if key not in self.tags:
+            self.tags[key] = [record.tag]
+            self.categories[key] = [record.category]
+            return True
+        if record.tag not in self.tags[key]:
+            self.tags[key].append(record.tag)
+            logger.debug(f"Tweet {key} already stored. Adding tag {record.tag}")
+        if record.category not in self.categories[key]:
+            self.categories[key].append(record.category)
+        return False
+
+    def seed(self, data: pd.DataFrame) -> None:
+        # Rebuild from spooled batches so a resumed run does not store them twice
+        if data.empty:
+            return
+        for category, tag, username, tweetText, tweet_link in zip(data["category"], data["tag"], data["username"], data["tweetText"], data["tweet_link"]):
+            key = self.key(username, tweetText, tweet_link)
+            if tag not in self.tags.setdefault(key, []):
+                self.tags[key].append(tag)
+            if category not in self.categories.setdefault(key, []):
+                self.categories[key].append(category)
+        logger.info(f"Seeded dedup index with {len(self)} spooled tweets")
+
+    def annotate(self, data: pd.DataFrame) -> pd.DataFrame:
+        keys = [
+            self.key(username, tweetText, tweet_link)
+            for username, tweetText, tweet_link in zip(data["username"], data["tweetText"], data["tweet_link"])
+        ]
+        data = data.copy()
+        data["tags"] = pd.array(
+            [TAG_SEPARATOR.join(self.tags.get(key, [tag])) for key, tag in zip(keys, data["tag"])],
+            dtype="string",
+        )
+        data["categories"] = pd.array(
+            [TAG_SEPARATOR.join(self.categories.get(key, [category])) for key, category in zip(keys, data["category"])],
+            dtype="string",
+        )
+        shared = int((data["tags"].str.contains(TAG_SEPARATOR, regex=False)).sum())
+        logger.info(f"Annotated {len(data)} tweets with matching tags ({shared} found under more than one tag)")
+        return data
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Columns produced by the scraper, in output order. Matches TweetData plus the
+# category and tweet_link columns that the loaders and dashboard expect.
+TWEET_SCHEMA = pa.schema([
+    ("category", pa.string()),
+    ("tag", pa.string()),
+    ("username", pa.string()),
+    ("tweetText", pa.string()),
+    ("postTimeRaw", pa.timestamp("us")),
+    ("scrapeTime", pa.timestamp("us")),
+    ("tweet_link", pa.string()),
+])
+
+
+@dataclass(slots=True)
+class TweetRecord:
+    category: str
+    tag: str
+    username: str
+    tweetText: str
+    postTimeRaw: datetime
+    scrapeTime: datetime
+    tweet_link: str
+
+
+TWEET_FIELDS = tuple(field.name for field in fields(TweetRecord))
+
+
+class TweetRecordBuilder:
+    __slots__ = ("columns",)
+
+    def __init__(self):
+        self.columns: dict[str, list] = {name: [] for name in TWEET_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.columns["tweet_link"])
+
+    def append(self, record: TweetRecord) -> None:
+        for name in TWEET_FIELDS:
+            self.columns[name].append(getattr(record, name))
+
+    def extend(self, records: list[TweetRecord]) -> "TweetRecordBuilder":
+        for record in records:
+            self.append(record)
+        return self
+
+    def to_arrow(self) -> pa.Table:
+        table = pa.Table.from_pydict(self.columns, schema=TWEET_SCHEMA)
+        post_time = table["postTimeRaw"]
+        return (
+            table
+            .append_column("year", pc.year(post_time).cast(pa.int32()))
+            .append_column("month", pc.month(post_time).cast(pa.int32()))
+            .append_column("day", pc.day(post_time).cast(pa.int32()))
+        )
+
+    def to_pandas(self) -> pd.DataFrame:
+        # Arrow-backed strings avoid copying text into Python objects
+        return self.to_arrow().to_pandas(
+            types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get,
+            coerce_temporal_nanoseconds=True,
+        )
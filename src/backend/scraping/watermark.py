@@ -0,0 +1,125 @@
+import json
+import os
+import re
+from pathlib import Path
+import pandas as pd
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import WATERMARK_PATH
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+STATUS_ID_PATTERN = re.compile(r"/status/(\d+)")
+
+
+def parse_status_id(tweet_link: str | None) -> int | None:
+    if not tweet_link:
+        return None
+    match = STATUS_ID_PATTERN.search(tweet_link)
+    return int(match.group(1)) if match else None
+
+
+# Newest status ID already collected per tag. Live search is newest-first and status
+# IDs grow with time, so reaching an ID at or below the watermark means the rest of
+# the timeline has been seen before. A scrape that stops early (scroll budget) leaves
+# a gap between the old watermark and the oldest tweet it reached; gaps are stored as
+# (floor, ceiling) and backfilled by later runs with max_id.
+class TagWatermarkStore:
+    def __init__(self, path: str | Path = WATERMARK_PATH):
+        self.path = Path(path)
+        self.watermarks: dict[str, int] = {}
+        self.gaps: dict[str, tuple[int, int]] = {}
+        self._read()
+        # Scrape outcomes of this run, applied by advance() once the data is loaded
+        self.pending: dict[str, tuple[bool, bool | None]] = {}
+
+    def get(self, tag: str) -> int | None:
+        return self.watermarks.get(tag)
+
+    def get_many(self, tags: list[str]) -> int | None:
+        # A combined query can only stop where every one of its tags has been seen
+        watermarks = [self.watermarks.get(tag) for tag in tags]
+        if not watermarks or None in watermarks:
+            return None
+        return min(watermarks)
+
+    def gap(self, tags: list[str]) -> tuple[int, int] | None:
+        gaps = [self.gaps[tag] for tag in tags if tag in self.gaps]
+        if not gaps:
+            return None
+        return min(floor for floor, _ in gaps), max(ceiling for _, ceiling in gaps)
+
+    def mark_scrape(self, tags: list[str], reached: bool, gap_reached: bool | None = None) -> None:
+        # reached: the scrape got down to the watermark or the timeline end.
+        # gap_reached: same for the gap backfill, None if no backfill ran.
+        for tag in tags:
+            self.pending[tag] = (reached, gap_reached)
+
+    def advance(self, data: pd.DataFrame, exclude_tags: set[str] | frozenset[str] = frozenset()) -> None:
+        changed = False
+        newest: dict[str, int] = {}
+        oldest: dict[str, int] = {}
+        # Tweets deduplicated across tags advance every tag they were found under
+        tag_lists = data["tags"].str.split(",") if "tags" in data else data["tag"].map(lambda tag: [tag])
+        for tag_list, tweet_link in zip(tag_lists, data["tweet_link"]):
+            status_id = parse_status_id(tweet_link)
+            if status_id is None:
+                continue
+            for tag in tag_list:
+                newest[tag] = max(newest.get(tag, status_id), status_id)
+                oldest[tag] = min(oldest.get(tag, status_id), status_id)
+
+        for tag, (reached, gap_reached) in self.pending.items():
+            if tag in exclude_tags:
+                continue
+            gap = self.gaps.get(tag)
+            if gap is not None and gap_reached is not None:
+                # A finished backfill closes the gap; otherwise it shrinks to the oldest tweet reached
+                gap = None if gap_reached else (gap[0], min(gap[1], oldest.get(tag, gap[1])))
+            previous = self.watermarks.get(tag)
+            if not reached and previous is not None and oldest.get(tag, 0) > previous:
+                # Stopped above the old watermark: the tweets in between are still unseen
+                floor, ceiling = previous, oldest[tag]
+                if gap is not None:
+                    floor, ceiling = min(gap[0], floor), max(gap[1], ceiling)
+                gap = (floor, ceiling)
+                logger.info(f"Scrape of {tag} stopped early; backfilling {floor}..{ceiling} next run")
+            if gap != self.gaps.get(tag):
+                if gap is None:
+                    del self.gaps[tag]
+                else:
+                    self.gaps[tag] = gap
+                changed = True
+        self.pending.clear()
+
+        for tag, status_id in newest.items():
+            if status_id > self.watermarks.get(tag, 0):
+                self.watermarks[tag] = status_id
+                changed = True
+        if changed:
+            self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"watermarks": self.watermarks, "gaps": self.gaps}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved watermarks for {len(self.watermarks)} tags ({len(self.gaps)} gaps) to {self.path}")
+
+    def _read(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            # Files written before gaps were tracked hold the watermarks only
+            if "watermarks" not in data:
+                data = {"watermarks": data, "gaps": {}}
+            self.watermarks = {tag: int(status_id) for tag, status_id in data["watermarks"].items()}
+            self.gaps = {tag: (int(floor), int(ceiling)) for tag, (floor, ceiling) in data["gaps"].items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable watermark file {self.path}: {e}")
+            self.watermarks, self.gaps = {}, {}
@@ -2,23 +2,83 @@ from playwright.sync_api import sync_playwright
 from rich.prompt import Prompt
 from rich.text import Text
 from pathlib import Path
+from datetime import datetime, timedelta
 import json
 import os
+import time
 import urllib.parse
 # Import modern logging configuration
 from config.logging.modern_log import LoggingConfig
 # Import path configuration
-from config.path_config import AUTH_TWITTER
+from config.path_config import AUTH_TWITTER, SESSION_CHECK_DIR
 
 
 logger = LoggingConfig(level="DEBUG").get_logger()
 
-def validate_session(playwright):
+# Cookies X needs for a logged-in search
+REQUIRED_COOKIES = ("auth_token", "ct0")
+VALIDATION_TTL = timedelta(hours=6)
+
+def validated_at_path(storage_state=AUTH_TWITTER) -> Path:
+    return SESSION_CHECK_DIR / f"{Path(storage_state).stem}.validated.json"
+
+def cookies_valid(storage_state=AUTH_TWITTER, margin: timedelta = timedelta(minutes=10)) -> bool:
+    try:
+        with open(storage_state, encoding="utf-8") as f:
+            cookies = json.load(f).get("cookies", [])
+    except (OSError, ValueError) as e:
+        logger.debug(f"Cannot read session file {storage_state}: {e}")
+        return False
+    expires_by_name = {cookie["name"]: cookie.get("expires", -1) for cookie in cookies if "x.com" in cookie.get("domain", "")}
+    deadline = time.time() + margin.total_seconds()
+    for name in REQUIRED_COOKIES:
+        if name not in expires_by_name:
+            logger.warning(f"Session {storage_state} has no '{name}' cookie")
+            return False
+        # -1 marks a browser-session cookie, which has no expiry of its own
+        if expires_by_name[name] != -1 and expires_by_name[name] < deadline:
+            logger.warning(f"Cookie '{name}' in {storage_state} has expired")
+            return False
+    return True
+
+def mark_validated(storage_state=AUTH_TWITTER) -> None:
+    SESSION_CHECK_DIR.mkdir(parents=True, exist_ok=True)
+    with open(validated_at_path(storage_state), "w", encoding="utf-8") as f:
+        json.dump({"validated_at": datetime.now().isoformat(timespec="seconds")}, f)
+
+def validation_fresh(storage_state=AUTH_TWITTER, ttl: timedelta = VALIDATION_TTL) -> bool:
+    try:
+        with open(validated_at_path(storage_state), encoding="utf-8") as f:
+            validated_at = datetime.fromisoformat(json.load(f)["validated_at"])
+    except (OSError, ValueError, KeyError):
+        return False
+    return datetime.now() - validated_at < ttl
+
+def check_session(storage_state=AUTH_TWITTER, ttl: timedelta = VALIDATION_TTL, playwright=None) -> bool:
+    # Cheap local checks first; the browser probe only runs when the cache is stale
+    if not cookies_valid(storage_state):
+        return False
+    if validation_fresh(storage_state, ttl):
+        logger.debug(f"Session {storage_state} validated within {ttl}. Skipping browser probe.")
+        return True
+    if playwright is not None:
+        return validate_session(playwright, storage_state)
+    with sync_playwright() as p:
+        return validate_session(p, storage_state)
+
+def logged_out(page, context) -> bool:
+    # Definite signals only: X sent the browser to its login flow, or dropped the auth cookies
+    if "/login" in page.url or "/i/flow/login" in page.url:
+        return True
+    cookie_names = {cookie["name"] for cookie in context.cookies("https://x.com")}
+    return not all(name in cookie_names for name in REQUIRED_COOKIES)
+
+def validate_session(playwright, storage_state=AUTH_TWITTER):
     encoded = urllib.parse.quote("#ธรรมศาสตร์ช้างเผือก", safe='')
     url = f"https://x.com/search?q={encoded}&src=typeahead_click&f=live"
 
     browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context(storage_state=AUTH_TWITTER, viewport={"width": 1280, "height": 1024})
+    context = browser.new_context(storage_state=storage_state, viewport={"width": 1280, "height": 1024})
     page = context.new_page()
 
     try:
@@ -26,12 +86,23 @@ def validate_session(playwright):
         logger.debug("Page loaded. Waiting for initial tweets...")
         page.wait_for_selector("article", timeout=30000)
         logger.info("Valid session detected.")
+        mark_validated(storage_state)
         return True
     except Exception as e:
-        logger.error(f"Session invalid or timed out: {e}")
-        if os.path.exists(AUTH_TWITTER):
-            os.remove(AUTH_TWITTER)
-            logger.info("Removed invalid session file")
+        try:
+            is_logged_out = logged_out(page, context)
+        except Exception as check_error:
+            logger.debug(f"Could not inspect the session after the probe failed: {check_error}")
+            is_logged_out = False
+        if not is_logged_out:
+            # A slow or failing X response says nothing about the session; keep it for the next run
+            logger.warning(f"Session probe for {storage_state} failed without a logout signal: {e}")
+            return False
+        logger.error(f"Session {storage_state} is logged out: {e}")
+        for path in (storage_state, validated_at_path(storage_state)):
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info("Removed invalid session file")
         return False
     finally:
         browser.close()
@@ -54,6 +125,6 @@ def login_and_save_session(playwright):
 
 if __name__ == "__main__":
     with sync_playwright() as p:
-        if not os.path.exists(AUTH_TWITTER) or not validate_session(p):
+        if not check_session(playwright=p):
             login_and_save_session(p)
             validate_session(p)
\ No newline at end of file
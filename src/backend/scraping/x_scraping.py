@@ -1,6 +1,9 @@
 import urllib.parse
 import asyncio
-from playwright.async_api import async_playwright
+import json
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import time
 from datetime import datetime
 import random
@@ -15,18 +18,149 @@ from config.path_config import AUTH_TWITTER
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import LakeFS loader
 from src.backend.load.lakefs_loader import LakeFSLoader
+# Import shared browser pool
+from src.backend.scraping.browser_pool import BrowserPool, connect_or_launch
+# Import timeline response parser
+from src.backend.scraping.timeline_parser import TimelineParser
+# Import status ID parsing for watermarks
+from src.backend.scraping.watermark import parse_status_id
+# Import compact tweet records
+from src.backend.scraping.tweet_record import TweetRecord, TweetRecordBuilder
+# Import run-wide dedup index
+from src.backend.scraping.tweet_index import TweetIndex
+# Import shared adaptive rate limiter
+from src.backend.scraping.rate_limiter import AdaptiveRateLimiter
+# Import resource blocking for lightweight pages
+from src.backend.scraping.resource_blocker import ResourceBlocker
+# Import content-driven scroll waits
+from src.backend.scraping.content_waiter import ContentWaiter
+# Import page memory tracking and recycling
+from src.backend.scraping.page_memory import PageMemory, PageRecyclePolicy
+# Import raw capture archive
+from src.backend.scraping.raw_archive import RawArchive
+# Import scrape-time relevance filter
+from src.backend.scraping.tweet_filter import TweetFilter
+# Import sliding-window tag scheduler
+from src.backend.scraping.tag_scheduler import SlidingWindowScheduler
+# Import combined OR-query helpers
+from src.backend.scraping.tag_query import MAX_QUERY_LENGTH, build_or_queries, split_query, attribute_tags, with_max_id
 
 logger = LoggingConfig(level="DEBUG", level_console="DEBUG").get_logger()
 
+# Mirrors extract_articles, but runs inside the page on a single article node
+EXTRACT_ARTICLE_JS = """
+(article) => {
+    const displayName = article.querySelector("[data-testid='User-Name']");
+    if (!displayName) return null;
+    const links = displayName.querySelectorAll("a");
+    if (links.length <= 2) return null;
+    const spans = displayName.querySelectorAll("span");
+    const time = displayName.querySelector("time");
+    const text = article.querySelector("[data-testid='tweetText']");
+    if (spans.length <= 3 || !time || !text) return null;
+    return {
+        username: (spans.length === 4 ? spans[2] : spans[3]).textContent.trim(),
+        text: text.textContent.trim(),
+        datetime: time.getAttribute("datetime"),
+        link: links[2].getAttribute("href"),
+    };
+}
+"""
+
+EXTRACT_ARTICLES_JS = """
+() => Array.from(document.querySelectorAll("article")).map(%s).filter(Boolean)
+""" % EXTRACT_ARTICLE_JS.strip()
+
+ARTICLE_HTML_JS = """
+() => Array.from(document.querySelectorAll("article")).map((article) => article.outerHTML)
+"""
+
+# X recycles article nodes while scrolling, so record every article as soon as it is
+# mounted or refilled and keep the records in window.__tweetBuffer until drained.
+ARTICLE_OBSERVER_JS = """
+(() => {
+    if (window.__tweetBuffer) return;
+    window.__tweetBuffer = [];
+    const extract = %s;
+    const seen = new Set();
+    const pending = new Set();
+    let scheduled = false;
+
+    const flush = () => {
+        scheduled = false;
+        for (const article of pending) {
+            const record = extract(article);
+            if (record && !seen.has(record.link)) {
+                seen.add(record.link);
+                window.__tweetBuffer.push(record);
+            }
+        }
+        pending.clear();
+    };
+    const collect = (node) => {
+        const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+        if (!element) return;
+        const article = element.closest("article");
+        if (article) pending.add(article);
+        element.querySelectorAll("article").forEach((a) => pending.add(a));
+        if (!scheduled) {
+            scheduled = true;
+            setTimeout(flush, 50);
+        }
+    };
+    const start = () => {
+        collect(document.body);
+        new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                mutation.addedNodes.forEach(collect);
+            }
+        }).observe(document.body, { childList: true, subtree: true });
+    };
+    if (document.body) start();
+    else document.addEventListener("DOMContentLoaded", start);
+})();
+""" % EXTRACT_ARTICLE_JS.strip()
+
+DRAIN_ARTICLE_BUFFER_JS = "() => (window.__tweetBuffer || []).splice(0)"
+
+EXTRACT_MODES = ("dom", "batch", "observer", "network")
+# Stop reasons after which everything down to the watermark has been seen
+COMPLETE_STOPS = ("watermark", "end")
+# X's "No results" placeholder, shown instead of articles for a search with no tweets
+EMPTY_STATE_SELECTOR = "[data-testid='emptyState']"
+# Error pages X shows when it throttles a session
+BLOCK_MESSAGES = ("Rate limit exceeded", "Something went wrong. Try reloading.")
+
 class XScraping:
-    def __init__(self):
-        pass
+    def __init__(self, browser_pool: BrowserPool | None = None, rate_limiter: AdaptiveRateLimiter | None = None, block_resources: bool = False, tweet_index: TweetIndex | None = None, scroll_timeout: float = 8.0, recycle_policy: PageRecyclePolicy | None = None, raw_archive: RawArchive | None = None, tweet_filter: TweetFilter | None = None, start_gate=None):
+        self.browser_pool = browser_pool
+        self.tweet_index = tweet_index
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.scroll_timeout = scroll_timeout
+        self.recycle_policy = recycle_policy or PageRecyclePolicy()
+        self.raw_archive = raw_archive
+        self.tweet_filter = tweet_filter
+        # Awaited before every navigation, e.g. SlidingWindowScheduler.wait_turn
+        self.start_gate = start_gate
+        self.scroll_count = 0
+        # Tweets the tag matched, counted before the run-wide dedup drops ones found under other tags
+        self.matched_count = 0
+        self.stop_reason: str | None = None
+        # Set when the last article wait found X's empty-results page or a block
+        self.empty_timeline = False
+        self.page_blocked = False
+        self.block_resources = block_resources
+        self.resource_blocker = ResourceBlocker()
+        self.timeline_parser = TimelineParser()
 
-    def encode_tag_to_url(self, tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
+    def encode_tag_to_url(self, tags: dict[str, list[str]], combine: bool = False, max_query_length: int = MAX_QUERY_LENGTH) -> dict[str, dict[str, str]]:
         encoded_tags_by_category = {}
 
         for category, tag_list in tags.items():
             encoded_tags = {}
+            # Combined mode searches "#a OR #b ..." once per chunk instead of once per tag
+            if combine:
+                tag_list = build_or_queries(tag_list, max_length=max_query_length)
             for i, tag in enumerate(tag_list):
                 text_encoded = urllib.parse.quote(tag, safe="")
                 target_url = f"https://x.com/search?q={text_encoded}&src=typed_query&f=live"
@@ -34,26 +168,126 @@ class XScraping:
                 encoded_tags[tag] = target_url
             encoded_tags_by_category[category] = encoded_tags
 
-        logger.info(f"Encoded tags for {len(tags)} categories to URL format")
+        logger.info(f"Encoded {sum(len(urls) for urls in encoded_tags_by_category.values())} queries for {len(tags)} categories to URL format")
         return encoded_tags_by_category
 
     async def wait_for_articles_with_retry(self, page, max_retries: int =2) -> bool:
+        self.empty_timeline = self.page_blocked = False
         for retry in range(max_retries):
             if await self.is_article_present(page):
                 return True
+            if self.empty_timeline or self.page_blocked:
+                # An empty result will not change on retry, and a block already backed the rate off once
+                return False
             logger.warning(f"Retry {retry+1}/{max_retries} - Waiting before next try...")
-            await asyncio.sleep(random.uniform(10.0, 22.0))
+            await self.rate_limiter.acquire()
         return False
 
     async def is_article_present(self, page) -> bool:
         try:
-            await page.wait_for_selector("article", timeout=5000)
-            logger.debug("Found article on the page")
+            await page.wait_for_selector(f"article, {EMPTY_STATE_SELECTOR}", timeout=5000)
+        except PlaywrightTimeoutError:
+            # Only a login redirect or X's error page is a block; a slow timeline is not
+            if await self.is_blocked(page):
+                logger.error(f"X Blocked us Please try again later 😢")
+                self.page_blocked = True
+                self.rate_limiter.on_block()
+                await page.screenshot(path="tmp/debug_screenshot_no_tweets.png")
+            else:
+                logger.warning("No article or empty-results page within 5s")
+            return False
+        if await page.query_selector("article") is None:
+            logger.debug("X returned no results for this search")
+            self.empty_timeline = True
+            return False
+        logger.debug("Found article on the page")
+        self.rate_limiter.on_success()
+        return True
+
+    async def is_blocked(self, page) -> bool:
+        if "/login" in page.url or "/i/flow/login" in page.url:
             return True
-        except TimeoutError as t:
-            logger.error(f"X Blocked us Please try again later 😢")
-            await page.screenshot(path="tmp/debug_screenshot_no_tweets.png")
+        try:
+            body_text = await page.inner_text("body", timeout=1000)
+        except PlaywrightTimeoutError:
             return False
+        return any(message in body_text for message in BLOCK_MESSAGES)
+
+    def add_tweet_entry(self, category: str, tag: str, userName: str, tweetText: str, postTime: datetime, tweet_link: str, seen_pairs: set, all_tweet_entries: list) -> bool:
+        key = (userName, tweetText)
+        if key in seen_pairs:
+            return False
+        seen_pairs.add(key)
+        all_tweet_entries.append(TweetRecord(
+            category=category,
+            tag=tag,
+            username=userName,
+            tweetText=tweetText,
+            postTimeRaw=postTime,
+            scrapeTime=datetime.now().replace(microsecond=0),
+            tweet_link=tweet_link,
+        ))
+        return True
+
+    def capture_timeline_responses(self, page) -> list:
+        pending = []
+
+        def on_response(response):
+            if response.ok and self.timeline_parser.is_timeline_response(response.url):
+                # Raw bytes, so the exact payload can also go to the archive
+                pending.append(asyncio.ensure_future(response.body()))
+
+        page.on("response", on_response)
+        return pending
+
+    async def extract_timeline_responses(self, category: str, tag: str, pending: list, seen_pairs: set, all_tweet_entries: list) -> int | None:
+        responses, pending[:] = pending[:], []
+        if not responses:
+            return None
+        count_tweets = 0
+        parsed_tweets = []
+        try:
+            bodies = await asyncio.gather(*responses)
+            if self.raw_archive is not None:
+                await asyncio.to_thread(self.raw_archive.put_many, "timeline", bodies, category, tag)
+            for body in bodies:
+                parsed_tweets.extend(self.timeline_parser.parse(json.loads(body)))
+        except Exception as e:
+            logger.warning(f"Failed to parse timeline response for {tag}: {e}")
+            return None
+        if not parsed_tweets:
+            return None
+        for tweet in parsed_tweets:
+            if self.add_tweet_entry(category, tag, tweet["username"], tweet["tweetText"], tweet["postTimeRaw"], tweet["tweet_link"], seen_pairs, all_tweet_entries):
+                count_tweets += 1
+        logger.debug(f"Captured {count_tweets} tweets from {len(responses)} timeline responses - {tag}")
+        return count_tweets
+
+    async def extract_articles_batch(self, category: str, tag: str, page, seen_pairs: set, all_tweet_entries: list) -> int:
+        records = await page.evaluate(EXTRACT_ARTICLES_JS)
+        return self.add_article_records(category, tag, records, seen_pairs, all_tweet_entries)
+
+    async def drain_article_buffer(self, category: str, tag: str, page, seen_pairs: set, all_tweet_entries: list) -> int:
+        records = await page.evaluate(DRAIN_ARTICLE_BUFFER_JS)
+        if not records:
+            logger.debug(f"Article buffer empty. Falling back to batch extraction - {tag}")
+            return await self.extract_articles_batch(category, tag, page, seen_pairs, all_tweet_entries)
+        return self.add_article_records(category, tag, records, seen_pairs, all_tweet_entries)
+
+    def add_article_records(self, category: str, tag: str, records: list[dict], seen_pairs: set, all_tweet_entries: list) -> int:
+        count_tweets = 0
+        for record in records:
+            if not (record["username"] and record["text"] and record["datetime"]):
+                continue
+            try:
+                dt_naive = datetime.strptime(record["datetime"], "%Y-%m-%dT%H:%M:%S.%fZ")
+            except ValueError as e:
+                logger.error(f"Invalid datetime format: {record['datetime']} | Error: {e}")
+                continue
+            if self.add_tweet_entry(category, tag, record["username"], record["text"], dt_naive, f"https://x.com{record['link']}", seen_pairs, all_tweet_entries):
+                count_tweets += 1
+        logger.debug(f"Extracted {count_tweets} new tweets from {len(records)} articles - {tag}")
+        return count_tweets
 
     async def extract_articles(self, category: str, tag: str, count_tweets: int, articles: list, seen_pairs: set, all_tweet_entries: list) -> None:
         for i, article in enumerate(articles):
@@ -70,7 +304,6 @@ class XScraping:
             if displayName:
                 spans = await displayName.query_selector_all("span")
                 time_tag = await displayName.query_selector("time")
-                asyncio.sleep(random.uniform(5.0, 11.5))
                 tweetText_tag = await article.query_selector("[data-testid='tweetText']")
                 if len(spans) > 3 and time_tag and tweetText_tag:
                     if len(spans) == 4:
@@ -85,19 +318,7 @@ class XScraping:
                     if userName and tweetText and dateTime:
                         try:
                             dt_naive = datetime.strptime(dateTime, "%Y-%m-%dT%H:%M:%S.%fZ")
-                            now = datetime.now()
-                            key = (userName, tweetText)
-                            if key not in seen_pairs:
-                                seen_pairs.add(key)
-                                all_tweet_entries.append({
-                                    "category": category,
-                                    "tag": tag,
-                                    "username": userName,
-                                    "tweetText": tweetText,
-                                    "postTimeRaw": dt_naive,
-                                    "scrapeTime": now.strftime("%Y-%m-%dT%H:%M:%S"),
-                                    "tweet_link": f"https://x.com{tweet_link}"
-                                })
+                            if self.add_tweet_entry(category, tag, userName, tweetText, dt_naive, f"https://x.com{tweet_link}", seen_pairs, all_tweet_entries):
                                 count_tweets += 1
                                 logger.debug(f"Scraped tweet {count_tweets} - {tag}")
                         except ValueError as e:
@@ -108,79 +329,205 @@ class XScraping:
             else:
                 logger.debug("No display name found for the article.")
 
-    async def scrape_all_tweet_texts(self, category: str, tag: str, tag_url: str, max_scrolls: int = 1, view_browser: bool = True) -> list[dict]:
-        logger.debug(f"Starting scraping: {tag}")
-        all_tweet_entries = []
-        seen_pairs = set() 
-        count_tweets = 0
+    @asynccontextmanager
+    async def open_page(self, view_browser: bool = True):
+        if self.browser_pool is not None:
+            async with self.browser_pool.page() as page:
+                yield page
+            return
+
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=view_browser)
-            context = await browser.new_context(
-                storage_state=AUTH_TWITTER,
-                viewport={"width": 1280, "height": 1024}
-            )
+            browser, context, remote = await connect_or_launch(p, AUTH_TWITTER, headless=view_browser)
             page = await context.new_page()
-            await page.goto(tag_url)
-            await asyncio.sleep(random.uniform(10, 20.0))
-
-            # Check if the page has loaded tweets
-            if not await self.wait_for_articles_with_retry(page):
-                logger.error(f"No articles found for tag: {tag} (Initial load)")
+            if remote:
+                await page.set_viewport_size({"width": 1280, "height": 1024})
+            try:
+                yield page
+            finally:
+                if remote:
+                    await page.close()
                 await browser.close()
-                return all_tweet_entries
-
-            now_height = 0
-            for i in range(max_scrolls):
-                if i > 0:
-                    scroll_distance = random.randint(2800, 3800)
-                    await page.evaluate(f"window.scrollBy(0, {scroll_distance});")
-                    logger.debug(f"Scroll attempt {i+1}/{max_scrolls} - Scrolling by {scroll_distance}px")
-                    await asyncio.sleep(random.uniform(10, 17))
-                    # Check if the page has loaded tweets
-                    if not await self.wait_for_articles_with_retry(page):
-                        logger.warning(f"No articles found on scroll {i+1}")
+
+    async def extract_scroll(self, extract_mode: str, category: str, tag: str, page, pending_responses: list, seen_pairs: set, all_tweet_entries: list) -> bool:
+        if extract_mode == "network":
+            captured = await self.extract_timeline_responses(category, tag, pending_responses, seen_pairs, all_tweet_entries)
+            if captured is not None:
+                return True
+            logger.debug(f"No parsable timeline response. Falling back to DOM extraction - {tag}")
+
+        if self.raw_archive is not None:
+            # gzip and disk writes for every article would stall the other lanes' event loop
+            await asyncio.to_thread(self.raw_archive.put_many, "article", await page.evaluate(ARTICLE_HTML_JS), category, tag)
+        if extract_mode == "batch":
+            await self.extract_articles_batch(category, tag, page, seen_pairs, all_tweet_entries)
+            return True
+        if extract_mode == "observer":
+            await self.drain_article_buffer(category, tag, page, seen_pairs, all_tweet_entries)
+            return True
+
+        articles = await page.query_selector_all("article")
+        if not articles:
+            return False
+        await self.extract_articles(category, tag, 0, articles, seen_pairs, all_tweet_entries)
+        return True
+
+    @staticmethod
+    def reached_watermark(all_tweet_entries: list, scroll_start: int, watermark: int) -> bool:
+        scroll_entries = all_tweet_entries[scroll_start:]
+        new_entries = [
+            entry for entry in scroll_entries
+            if (parse_status_id(entry.tweet_link) or watermark + 1) > watermark
+        ]
+        # Drop already-collected tweets so they are not validated and loaded again
+        all_tweet_entries[scroll_start:] = new_entries
+        return len(new_entries) < len(scroll_entries)
+
+    @staticmethod
+    def attribute_batch(batch: list[TweetRecord], query_tags: list[str]) -> list[list[str]]:
+        if len(query_tags) <= 1:
+            return [[record.tag] for record in batch]
+        tag_lists = []
+        for record in batch:
+            record_tags = attribute_tags(record.tweetText, query_tags)
+            record.tag = record_tags[0]
+            tag_lists.append(record_tags)
+        return tag_lists
+
+    def index_record(self, record: TweetRecord, record_tags: list[str]) -> bool:
+        is_new = self.tweet_index.add(record)
+        # Tweets matching several tags of a combined query are stored once under all of them
+        for extra_tag in record_tags[1:]:
+            self.tweet_index.add(replace(record, tag=extra_tag))
+        return is_new
+
+    async def iter_tweets(self, category: str, tag: str, tag_url: str, max_scrolls: int = 1, view_browser: bool = True, extract_mode: str = "dom", watermark: int | None = None):
+        if extract_mode not in EXTRACT_MODES:
+            raise ValueError(f"Unknown extract_mode '{extract_mode}'. Expected one of {EXTRACT_MODES}")
+        logger.debug(f"Starting scraping: {tag}")
+        query_tags = split_query(tag)
+        seen_pairs = set() 
+        total_tweets = 0
+        scrolls_done = self.scroll_count = self.matched_count = 0
+        # "budget" unless the timeline ended, the watermark was reached or the page failed
+        self.stop_reason = "budget"
+        oldest_id = None
+        resource_stats = None
+        page_url = tag_url
+        while scrolls_done < max_scrolls:
+            recycle = False
+            async with self.open_page(view_browser=view_browser) as page:
+                # Listen before navigating so the first timeline response is not missed
+                pending_responses = self.capture_timeline_responses(page) if extract_mode == "network" else []
+                if extract_mode == "observer":
+                    await page.add_init_script(ARTICLE_OBSERVER_JS)
+                resource_stats = await self.resource_blocker.attach(page, block=self.block_resources, stats=resource_stats)
+                content_waiter = ContentWaiter(page, timeout=self.scroll_timeout)
+                page_memory = PageMemory(page)
+                if self.start_gate is not None:
+                    await self.start_gate()
+                await self.rate_limiter.acquire()
+                resource_stats.started_at = time.perf_counter()
+                await page.goto(page_url)
+
+                # Check if the page has loaded tweets
+                if not await self.wait_for_articles_with_retry(page):
+                    if self.empty_timeline:
+                        logger.info(f"No tweets found for tag: {tag}")
+                        self.stop_reason = "end"
+                    else:
+                        logger.error(f"No articles found for tag: {tag} (Initial load)")
+                        self.stop_reason = "error"
+                    return
+                resource_stats.mark_loaded()
+
+                now_height = 0
+                page_scrolls = 0
+                while scrolls_done < max_scrolls:
+                    if page_scrolls > 0:
+                        signature = await content_waiter.signature()
+                        scroll_distance = random.randint(2800, 3800)
+                        await page.evaluate(f"window.scrollBy(0, {scroll_distance});")
+                        logger.debug(f"Scroll attempt {scrolls_done+1}/{max_scrolls} - Scrolling by {scroll_distance}px")
+                        # Wait for new content, but never less than the rate limiter's pacing floor
+                        _, content_signal = await asyncio.gather(self.rate_limiter.acquire(), content_waiter.wait(signature))
+                        # Check if the page has loaded tweets
+                        if not await self.wait_for_articles_with_retry(page):
+                            logger.warning(f"No articles found on scroll {scrolls_done+1}")
+                            # Usually a rate limit rather than the real end of the timeline
+                            self.stop_reason = "error"
+                            break
+
+                    logger.debug(f"Scroll attempt {scrolls_done+1}/{max_scrolls} - {tag}")
+                    new_height = await page.evaluate("document.body.scrollHeight")
+                    logger.debug(f"Now height: {now_height} - New height after scroll: {new_height}")
+                    if new_height == now_height and page_scrolls > 0 and content_signal != "timeout":
+                        # The wait ended before the next page could load; "end" closes gaps, so be sure
+                        if await content_waiter.wait_for_growth(now_height):
+                            new_height = await page.evaluate("document.body.scrollHeight")
+
+                    if new_height == now_height:
+                        logger.debug("Reached bottom of page or no new content loaded.")
+                        self.stop_reason = "end"
                         break
-                
-                logger.debug(f"Scroll attempt {i+1}/{max_scrolls} - {tag}")
-                new_height = await page.evaluate("document.body.scrollHeight")
-                await asyncio.sleep(random.uniform(9, 14))
-                logger.debug(f"Now height: {now_height} - New height after scroll: {new_height}")
-                
-                if new_height == now_height:
-                    logger.debug("Reached bottom of page or no new content loaded.")
-                    break
-                now_height = new_height
-
-                articles = await page.query_selector_all("article")
-                if articles:
-                    await self.extract_articles(category, tag, count_tweets, articles, seen_pairs, all_tweet_entries)
-                else:
-                    logger.debug("No articles found on the page.")
-                    break
-            
-            await browser.close()
-            logger.info(f"Finished scraping tag: {tag} | Total tweets: {len(all_tweet_entries)}")
+                    now_height = new_height
+                    scrolls_done += 1
+                    page_scrolls += 1
+                    self.scroll_count = scrolls_done
+
+                    batch = []
+                    if not await self.extract_scroll(extract_mode, category, tag, page, pending_responses, seen_pairs, batch):
+                        logger.debug("No articles found on the page.")
+                        self.stop_reason = "end"
+                        break
+                    status_ids = [status_id for status_id in (parse_status_id(record.tweet_link) for record in batch) if status_id is not None]
+                    oldest_id = min(status_ids + ([oldest_id] if oldest_id is not None else []), default=None)
 
+                    reached = watermark is not None and self.reached_watermark(batch, 0, watermark)
+                    tag_lists = self.attribute_batch(batch, query_tags)
+                    # Irrelevant tweets are dropped here, before indexing, validation and loading
+                    if self.tweet_filter is not None:
+                        keep = self.tweet_filter.keep_mask(batch)
+                        batch = [record for record, kept in zip(batch, keep) if kept]
+                        tag_lists = [record_tags for record_tags, kept in zip(tag_lists, keep) if kept]
+                    self.matched_count += len(batch)
+                    # Index only tweets this tag actually keeps, after the watermark cut
+                    if self.tweet_index is not None:
+                        batch = [record for record, record_tags in zip(batch, tag_lists) if self.index_record(record, record_tags)]
+                    if batch:
+                        total_tweets += len(batch)
+                        yield batch
+                    if reached:
+                        logger.info(f"Reached watermark {watermark} for tag: {tag} after {scrolls_done} scrolls")
+                        self.stop_reason = "watermark"
+                        break
+                    if scrolls_done < max_scrolls and await self.recycle_policy.should_recycle(page_memory, page_scrolls):
+                        recycle = True
+                        break
+
+            if not recycle or oldest_id is None:
+                break
+            # A fresh page starts from an empty DOM and heap, just below the last tweet seen
+            logger.info(f"Recycling page for {tag} after {page_scrolls} scrolls ({page_memory.summary()}). Resuming below status {oldest_id}")
+            page_url = with_max_id(tag_url, oldest_id - 1)
+
+        if resource_stats is not None:
+            logger.info(f"Resources for {tag}: {resource_stats.summary()}")
+        logger.info(f"Finished scraping tag: {tag} | Total tweets: {total_tweets}")
+
+    async def scrape_all_tweet_texts(self, category: str, tag: str, tag_url: str, max_scrolls: int = 1, view_browser: bool = True, extract_mode: str = "dom", watermark: int | None = None) -> list[TweetRecord]:
+        all_tweet_entries = []
+        async for batch in self.iter_tweets(category, tag, tag_url, max_scrolls=max_scrolls, view_browser=view_browser, extract_mode=extract_mode, watermark=watermark):
+            all_tweet_entries.extend(batch)
         return all_tweet_entries
 
     @staticmethod
-    def to_dataframe(all_tweet: list[dict]) -> pd.DataFrame:
+    def to_dataframe(all_tweet: list[TweetRecord] | TweetRecordBuilder) -> pd.DataFrame:
         logger.info(f"Converting to dataframe...")
-        all_tweet = pd.DataFrame(all_tweet)
-        all_tweet['category'] = all_tweet['category'].astype('string')
-        all_tweet['username'] = all_tweet['username'].astype('string')
-        all_tweet['tweetText'] = all_tweet['tweetText'].astype('string')
-        all_tweet['tag'] = all_tweet['tag'].astype('string')
-        all_tweet['tweet_link'] = all_tweet['tweet_link'].astype('string')
-
-        all_tweet['year'] = all_tweet['postTimeRaw'].dt.year
-        all_tweet['month'] = all_tweet['postTimeRaw'].dt.month
-        all_tweet['day'] = all_tweet['postTimeRaw'].dt.day
-
-        all_tweet['postTimeRaw'] = pd.to_datetime(all_tweet['postTimeRaw'])
-        all_tweet['scrapeTime'] = pd.to_datetime(all_tweet['scrapeTime'])
+        if not isinstance(all_tweet, TweetRecordBuilder):
+            all_tweet = TweetRecordBuilder().extend(all_tweet)
+        data = all_tweet.to_pandas()
         logger.info("Finished converting to dataframe.")
-        return all_tweet
+        return data
 
     @staticmethod
     def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str):
@@ -348,26 +695,20 @@ async def main():
         # ],
     }
 
-    x_scraping = XScraping()
-    tag_urls = x_scraping.encode_tag_to_url(tags)
+    all_results = []
 
+    async with BrowserPool(headless=True, max_pages_per_browser=3) as browser_pool:
+        tag_scheduler = SlidingWindowScheduler(concurrency=3)
+        x_scraping = XScraping(browser_pool=browser_pool, start_gate=tag_scheduler.wait_turn)
+        tag_urls = x_scraping.encode_tag_to_url(tags)
 
-    semaphore = asyncio.Semaphore(3)
-    all_results = []
+        tasks = []
+        for category, tag_url_dict in tag_urls.items():
+            for tag, url in tag_url_dict.items():
+                tasks.append((category, tag, url))
 
-    async def scrape_with_limit(category: str, tag: str, url: str):
-        async with semaphore:
-            result = await x_scraping.scrape_all_tweet_texts(category, tag, url)
-            return result
-        
-    tasks = []
-    for category, tag_url_dict in tag_urls.items():
-        for tag, url in tag_url_dict.items():
-            tasks.append(scrape_with_limit(category, tag, url))
-
-    logger.info(f"Starting scraping with {len(tasks)} tasks, max 3 concurrently...")
-    # tasks = [x_scraping.scrape_all_tweet_texts(tag=tag, tag_url=tag_urls[tag]) for tag in tag_urls.keys()]
-    results = await asyncio.gather(*tasks)
+        logger.info(f"Starting scraping with {len(tasks)} tasks, max 3 concurrently...")
+        results = await tag_scheduler.run(tasks, x_scraping.scrape_all_tweet_texts)
 
     for result in results:
         all_results.extend(result)
@@ -43,6 +43,10 @@ class ValidationPydantic:
         self.console = Console()
 
     def validate(self, df: pd.DataFrame, scrape_new: bool = False) -> bool:
+        rows_valid = self.validate_rows(df)
+        return self.validate_dataset(df, scrape_new=scrape_new) and rows_valid
+
+    def validate_rows(self, df: pd.DataFrame) -> bool:
         all_valid = True
         for idx, row in df.iterrows():
             data_dict = row.to_dict()
@@ -52,7 +56,9 @@ class ValidationPydantic:
                 all_valid = False
                 logger.error(f"Validation error in row {idx}:")
                 logger.error(e.json(indent=2))
-        
+        return all_valid
+
+    def validate_dataset(self, df: pd.DataFrame, scrape_new: bool = False) -> bool:
         if scrape_new:
             # Validation
             dataset_checks = {
@@ -73,7 +79,6 @@ class ValidationPydantic:
 
         failed_checks = [k for k, v in dataset_checks.items() if not v]
         if failed_checks:
-            all_valid = False
             panel_content = "\n".join(f"[bold red]✘[/bold red] {k}" if not v else f"[green]✔ {k}[/green]" 
                                       for k, v in dataset_checks.items())
             panel = Panel(panel_content, title="Dataset Validation Summary", border_style="bold red")
@@ -84,7 +89,7 @@ class ValidationPydantic:
             panel_content = "\n".join(f"[green]✔ {k}[/green]" for k in dataset_checks)
             panel = Panel(panel_content, title="Dataset Validation Summary", border_style="bold green")
             self.console.print(panel)
-        return all_valid
+        return True
 
     def _check_time_span(self, df: pd.DataFrame) -> bool:
         if 'postTimeRaw' not in df.columns: